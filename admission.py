@@ -0,0 +1,197 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# =============================================
+# CONFIGURATION DU CONTROLE D'ADMISSION
+# =============================================
+
+# Seau à jetons : capacité (rafale) et recharge en jetons par seconde
+SESSION_BURST = 3
+SESSION_RATE = 3 / 60
+IP_BURST = 10
+IP_RATE = 10 / 60
+# Seau commun aux envois sans adresse connue (st.context.ip_address n'existe
+# qu'à partir de Streamlit 1.45) : plus large qu'une IP, jamais illimité
+SIN_IP_BURST = 30
+SIN_IP_RATE = 30 / 60
+
+# Nombre de proxys de confiance devant l'application (0 : X-Forwarded-For
+# ignoré). Chaque proxy ajoute une adresse à droite ; celles de gauche
+# viennent du client et sont falsifiables
+TRUST_PROXY_ENV = "MEDIPEDIDO_TRUST_PROXY"
+
+# Fenêtre glissante de suppression des doublons
+DEDUP_WINDOW = 600.0
+
+# Clés suivies au plus (LRU) : la mémoire reste bornée pendant une attaque
+MAX_KEYS = 10000
+
+logger = logging.getLogger(__name__)
+
+# Motifs de refus
+ADMITIDO = "admitido"
+LIMITE_SESION = "limite_sesion"
+LIMITE_IP = "limite_ip"
+DUPLICADO = "duplicado"
+
+
+def _trusted_proxies(value):
+    # Valeur invalide : X-Forwarded-For ignoré plutôt qu'un échec au démarrage
+    try:
+        count = int(value or 0)
+    except ValueError:
+        count = -1
+    if count < 0:
+        logger.warning("%s=%r no es un número de proxys válido; se ignora X-Forwarded-For",
+                       TRUST_PROXY_ENV, value)
+        return 0
+    return count
+
+
+TRUSTED_PROXIES = _trusted_proxies(os.environ.get(TRUST_PROXY_ENV))
+
+# =============================================
+# LIMITEURS
+# =============================================
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens, updated):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    def __init__(self, rate, burst, max_keys=MAX_KEYS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def allow(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                bucket = TokenBucket(self.burst, now)
+            else:
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+                bucket.updated = now
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                # La clé la moins récente repart avec un seau plein : au pire une rafale de plus
+                self._buckets.popitem(last=False)
+            if bucket.tokens < 1:
+                return False
+            bucket.tokens -= 1
+            return True
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class Deduplicator:
+    def __init__(self, window=DEDUP_WINDOW, max_keys=MAX_KEYS):
+        self.window = window
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._seen = OrderedDict()
+
+    def seen(self, digest, now=None):
+        # Vrai si le même contenu est arrivé dans la fenêtre ; sinon il est retenu
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            # Ordre d'insertion = ordre chronologique : les expirés sont en tête
+            while self._seen:
+                oldest, at = next(iter(self._seen.items()))
+                if now - at < self.window:
+                    break
+                del self._seen[oldest]
+            if digest in self._seen:
+                return True
+            self._seen[digest] = now
+            if len(self._seen) > self.max_keys:
+                self._seen.popitem(last=False)
+            return False
+
+    def forget(self, digest):
+        # Message admis mais non enregistré : le renvoi ne doit pas être un doublon
+        with self._lock:
+            self._seen.pop(digest, None)
+
+    def __len__(self):
+        return len(self._seen)
+
+
+def content_digest(mensaje):
+    # Même expéditeur, même texte aux espaces et à la casse près
+    texto = " ".join(mensaje.get("mensaje", "").casefold().split())
+    clave = f"{mensaje.get('email', '').strip().casefold()}\n{texto}"
+    return hashlib.blake2b(clave.encode("utf-8"), digest_size=16).digest()
+
+# =============================================
+# ADMISSION DES MESSAGES
+# =============================================
+
+class AdmissionControl:
+    def __init__(self):
+        self.sessions = RateLimiter(SESSION_RATE, SESSION_BURST)
+        self.ips = RateLimiter(IP_RATE, IP_BURST)
+        self.sin_ip = RateLimiter(SIN_IP_RATE, SIN_IP_BURST, max_keys=1)
+        self._sin_ip_avisado = False
+        self.dedup = Deduplicator()
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys((ADMITIDO, LIMITE_SESION, LIMITE_IP, DUPLICADO), 0)
+
+    def admit(self, session_id, ip, mensaje):
+        # Uniquement de la mémoire : aucun accès disque ni réseau avant la décision
+        now = time.monotonic()
+        if not self.sessions.allow(session_id, now):
+            motivo = LIMITE_SESION
+        elif ip is not None and not self.ips.allow(ip, now):
+            motivo = LIMITE_IP
+        elif ip is None and not self._allow_without_ip(now):
+            motivo = LIMITE_IP
+        elif self.dedup.seen(content_digest(mensaje), now):
+            motivo = DUPLICADO
+        else:
+            motivo = ADMITIDO
+        with self._lock:
+            self.counters[motivo] += 1
+        return motivo
+
+    def _allow_without_ip(self, now):
+        if not self._sin_ip_avisado:
+            self._sin_ip_avisado = True
+            logger.warning("Dirección del cliente desconocida: límite común a todos los envíos sin IP")
+        return self.sin_ip.allow(None, now)
+
+    def withdraw(self, mensaje):
+        # À appeler quand un message admis n'a pas pu être mis en file
+        self.dedup.forget(content_digest(mensaje))
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+        counters.update(sesiones=len(self.sessions), ips=len(self.ips), huellas=len(self.dedup))
+        return counters
+
+
+_admission = None
+_admission_lock = threading.Lock()
+
+
+def get_admission():
+    # Un seul contrôle par processus : les limites valent pour toutes les sessions
+    global _admission
+    if _admission is None:
+        with _admission_lock:
+            if _admission is None:
+                _admission = AdmissionControl()
+    return _admission
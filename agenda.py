@@ -0,0 +1,237 @@
+import datetime
+import threading
+
+from booking_store import get_bookings
+
+# =============================================
+# CONFIGURATION DE L'AGENDA
+# =============================================
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+HORIZON_DAYS = 90
+HORIZON_SLOTS = HORIZON_DAYS * SLOTS_PER_DAY
+
+# Horaire d'ouverture par défaut : lundi à samedi, 8h - 20h.
+# Jour de la semaine -> plages (début, fin) en minutes depuis minuit
+OPENING_HOURS = {weekday: ((8 * 60, 20 * 60),) for weekday in range(6)}
+
+# =============================================
+# MASQUES DE BITS
+# =============================================
+# Chaque médecin a un entier Python : le bit i correspond au créneau i
+# de l'horizon. Les opérations &, |, >> travaillent mot machine par mot
+# machine, sans boucle Python sur les créneaux.
+
+def _range_mask(start, length):
+    return ((1 << length) - 1) << start
+
+
+def _opening_mask(first_day, hours=OPENING_HOURS):
+    mask = 0
+    for day in range(HORIZON_DAYS):
+        date = first_day + datetime.timedelta(days=day)
+        for start_minute, end_minute in hours.get(date.weekday(), ()):
+            start = day * SLOTS_PER_DAY + start_minute // SLOT_MINUTES
+            mask |= _range_mask(start, end_minute // SLOT_MINUTES - start_minute // SLOT_MINUTES)
+    return mask
+
+
+def _weekly_hours(horarios):
+    # (dia, inicio, fin) -> {dia: ((inicio, fin), ...)}
+    hours = {}
+    for dia, inicio, fin in horarios:
+        hours.setdefault(dia, []).append((inicio, fin))
+    return {dia: tuple(sorted(plages)) for dia, plages in hours.items()}
+
+
+def _runs(free, length):
+    # Bits i tels que les créneaux i .. i+length-1 sont tous libres
+    runs = free
+    for shift in range(1, length):
+        runs &= free >> shift
+    return runs
+
+
+def _lowest_bit(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+class Calendar:
+    __slots__ = ("busy", "lock", "hours", "open")
+
+    def __init__(self):
+        self.busy = 0
+        self.lock = threading.Lock()
+        # Horaire propre au médecin (None : horaire par défaut) et son masque
+        self.hours = None
+        self.open = None
+
+# =============================================
+# MOTEUR DE DISPONIBILITES
+# =============================================
+
+class AvailabilityEngine:
+    def __init__(self, first_day=None):
+        self._lock = threading.Lock()
+        self._calendars = {}
+        self.first_day = first_day or datetime.date.today()
+        self._open = _opening_mask(self.first_day)
+        self._full = _range_mask(0, HORIZON_SLOTS)
+        # Version du catalogue dont les horaires sont chargés
+        self._schedules_version = None
+
+    def _roll(self):
+        # L'horizon glisse chaque jour : on décale les bits des jours passés
+        today = datetime.date.today()
+        if today <= self.first_day:
+            return
+        with self._lock:
+            days = (today - self.first_day).days
+            if days <= 0:
+                return
+            shift = days * SLOTS_PER_DAY
+            for calendar in self._calendars.values():
+                with calendar.lock:
+                    calendar.busy >>= shift
+                    if calendar.hours is not None:
+                        calendar.open = _opening_mask(today, calendar.hours)
+            self.first_day = today
+            self._open = _opening_mask(today)
+
+    def _calendar(self, doctor_id):
+        calendar = self._calendars.get(doctor_id)
+        if calendar is None:
+            with self._lock:
+                calendar = self._calendars.setdefault(doctor_id, Calendar())
+        return calendar
+
+    def _opening(self, calendar):
+        return self._open if calendar.open is None else calendar.open
+
+    def load_schedules(self, version, horarios):
+        # horarios : (doctor_id, dia, inicio, fin) de tout le catalogue, chargés
+        # une fois par version. Sans plage importée : horaire par défaut. Les
+        # médecins au même horaire partagent un seul masque
+        if version == self._schedules_version:
+            return
+        by_doctor = {}
+        for doctor_id, dia, inicio, fin in horarios:
+            by_doctor.setdefault(doctor_id, []).append((dia, inicio, fin))
+        self._roll()
+        with self._lock:
+            masks = {}
+            doctors = set(by_doctor)
+            doctors.update(doctor_id for doctor_id, calendar in self._calendars.items() if calendar.hours is not None)
+            for doctor_id in doctors:
+                hours = _weekly_hours(by_doctor.get(doctor_id, ())) or None
+                calendar = self._calendars.setdefault(doctor_id, Calendar())
+                if calendar.hours == hours:
+                    continue
+                mask = None
+                if hours is not None:
+                    key = tuple(sorted(hours.items()))
+                    mask = masks.get(key)
+                    if mask is None:
+                        mask = masks[key] = _opening_mask(self.first_day, hours)
+                with calendar.lock:
+                    calendar.hours = hours
+                    calendar.open = mask
+            self._schedules_version = version
+
+    # -- Conversion créneau <-> date --------------
+
+    def slot_at(self, moment):
+        delta = moment - datetime.datetime.combine(self.first_day, datetime.time())
+        return int(delta.total_seconds() // (SLOT_MINUTES * 60))
+
+    def slot_datetime(self, slot):
+        start = datetime.datetime.combine(self.first_day, datetime.time())
+        return start + datetime.timedelta(minutes=slot * SLOT_MINUTES)
+
+    # -- Consultas --------------------------------
+
+    def free_mask(self, doctor_id):
+        self._roll()
+        calendar = self._calendar(doctor_id)
+        return self._opening(calendar) & ~calendar.busy & self._full
+
+    def is_free(self, doctor_id, slot, length=1):
+        if slot < 0 or slot + length > HORIZON_SLOTS:
+            return False
+        mask = _range_mask(slot, length)
+        return self.free_mask(doctor_id) & mask == mask
+
+    def next_free(self, doctor_id, after=0, length=1):
+        runs = _runs(self.free_mask(doctor_id), length) >> max(after, 0)
+        if not runs:
+            return None
+        return max(after, 0) + _lowest_bit(runs)
+
+    def free_slots(self, doctor_id, date, length=1, after=0):
+        day = (date - self.first_day).days
+        if not 0 <= day < HORIZON_DAYS:
+            return []
+        start = max(day * SLOTS_PER_DAY, after)
+        end = (day + 1) * SLOTS_PER_DAY
+        if start >= end:
+            return []
+        runs = (_runs(self.free_mask(doctor_id), length) >> start) & ((1 << (end - start)) - 1)
+        slots = []
+        while runs:
+            low = runs & -runs
+            slots.append(start + low.bit_length() - 1)
+            runs ^= low
+        return slots
+
+    # -- Réservations -----------------------------
+
+    def reserve(self, doctor_id, slot, length=1):
+        # Vérification et marquage sous le verrou du médecin : deux sessions
+        # ne peuvent pas obtenir le même créneau
+        self._roll()
+        if slot < 0 or slot + length > HORIZON_SLOTS:
+            return False
+        mask = _range_mask(slot, length)
+        calendar = self._calendar(doctor_id)
+        if self._opening(calendar) & mask != mask:
+            return False
+        with calendar.lock:
+            if calendar.busy & mask:
+                return False
+            calendar.busy |= mask
+        return True
+
+    def restore(self, doctor_id, moment, minutes):
+        # Rendez-vous déjà enregistré (redémarrage) : occupé sans revérifier l'horaire
+        slot = self.slot_at(moment)
+        end = min(slot + -(-minutes // SLOT_MINUTES), HORIZON_SLOTS)
+        slot = max(slot, 0)
+        if slot >= end:
+            return
+        calendar = self._calendar(doctor_id)
+        with calendar.lock:
+            calendar.busy |= _range_mask(slot, end - slot)
+
+    def release(self, doctor_id, slot, length=1):
+        calendar = self._calendar(doctor_id)
+        with calendar.lock:
+            calendar.busy &= ~_range_mask(slot, length)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_agenda():
+    # Un seul moteur par processus : les réservations sont visibles de toutes les sessions
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = AvailabilityEngine()
+                desde = datetime.datetime.combine(engine.first_day, datetime.time())
+                for doctor_id, inicio, minutos in get_bookings().upcoming(desde):
+                    engine.restore(doctor_id, inicio, minutos)
+                _engine = engine
+    return _engine
@@ -0,0 +1,119 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# =============================================
+# CONFIGURATION DES ARTICLES
+# =============================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Un fichier Markdown par article : <slug>.md
+CONTENT_DIR = os.environ.get("MEDIPEDIDO_CONTENT_DIR", os.path.join(BASE_DIR, "contenido", "articulos"))
+
+# Articles rendus gardés en mémoire (par processus)
+CACHE_SIZE = 256
+# Versions de fichier (chemin, mtime, taille) dont le hash est connu
+VERSIONS_SIZE = 4096
+
+MARKDOWN_EXTENSIONS = ("extra", "sane_lists", "smarty")
+
+_SLUG = re.compile(r"^[\w-]+$")
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_rendered = OrderedDict()
+_versions = OrderedDict()
+
+# =============================================
+# LECTURE PARESSEUSE
+# =============================================
+
+def body_path(slug):
+    # Le slug vient du catalogue, mais ne doit jamais sortir du dossier
+    if not _SLUG.match(slug):
+        return None
+    return os.path.join(CONTENT_DIR, f"{slug}.md")
+
+
+def _read(path):
+    # Une seule lecture : le même tampon sert au hash et au décodage
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _render_markdown(text):
+    # markdown n'est importé qu'à la première ouverture d'un article
+    import markdown
+
+    return markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+
+# =============================================
+# RENDU AVEC CACHE
+# =============================================
+
+def _cached(key):
+    # Sous _lock
+    html = _rendered.get(key)
+    if html is not None:
+        _rendered.move_to_end(key)
+    return html
+
+
+def article_html(slug):
+    # HTML du corps de l'article, ou None si le fichier n'existe pas ou est illisible
+    path = body_path(slug)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    version = (path, stat.st_mtime_ns, stat.st_size)
+
+    # Clé = hash du contenu : un fichier touché mais inchangé reste en cache.
+    # Version déjà hachée : servi sans relire le fichier
+    with _lock:
+        html = _cached(_versions.get(version))
+        if html is not None:
+            return html
+
+    try:
+        data = _read(path)
+    except FileNotFoundError:
+        return None
+    key = _digest(data)
+    with _lock:
+        _versions[version] = key
+        _versions.move_to_end(version)
+        while len(_versions) > VERSIONS_SIZE:
+            _versions.popitem(last=False)
+        html = _cached(key)
+        if html is not None:
+            return html
+
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        # Fichier mal encodé : la page affiche le résumé au lieu de planter
+        logger.warning("Artículo %s no está en UTF-8", path)
+        return None
+    html = _render_markdown(text)
+    with _lock:
+        _rendered[key] = html
+        _rendered.move_to_end(key)
+        while len(_rendered) > CACHE_SIZE:
+            _rendered.popitem(last=False)
+    return html
+
+
+def cache_info():
+    with _lock:
+        return {"articulos": len(_rendered), "bytes": sum(len(html) for html in _rendered.values())}
@@ -0,0 +1,61 @@
+import hashlib
+import os
+from functools import lru_cache
+
+from images import static_serving
+
+# =============================================
+# FEUILLE DE STYLE STATIQUE
+# =============================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STYLESHEET = os.path.join(BASE_DIR, "styles", "medipedido.css")
+
+# Dossier servi par Streamlit sous /app/static (server.enableStaticServing,
+# .streamlit/config.toml)
+STATIC_CSS_DIR = os.path.join(BASE_DIR, "static", "css")
+STATIC_CSS_URL = "app/static/css"
+
+# CSS embarquée dans la page : forcée ici, et automatique quand le service
+# statique est désactivé (sinon le <link> renverrait la page index.html) ou
+# quand le serveur ne sert pas les .css en text/css
+INLINE_CSS = os.environ.get("MEDIPEDIDO_INLINE_CSS") == "1"
+
+
+@lru_cache(maxsize=1)
+def serves_css():
+    # Serveur Tornado (Streamlit < 1.60) : toute extension hors de sa liste
+    # blanche part en text/plain + nosniff, et le navigateur refuse la feuille
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        return True
+    return ".css" in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+
+@lru_cache(maxsize=8)
+def _publish(source, mtime_ns):
+    with open(source, "rb") as f:
+        content = f.read()
+    # Le hash du contenu dans le nom : le navigateur peut garder le fichier indéfiniment
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    name = f"{os.path.splitext(os.path.basename(source))[0]}.{digest}.css"
+    target = os.path.join(STATIC_CSS_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(STATIC_CSS_DIR, exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, target)
+    return f"{STATIC_CSS_URL}/{name}", content.decode("utf-8")
+
+
+def stylesheet(source=STYLESHEET):
+    return _publish(source, os.stat(source).st_mtime_ns)
+
+
+def stylesheet_tag(source=STYLESHEET):
+    href, css = stylesheet(source)
+    if INLINE_CSS or not static_serving() or not serves_css():
+        return f"<style>{css}</style>"
+    return f'<link rel="stylesheet" href="{href}">'
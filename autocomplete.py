@@ -0,0 +1,115 @@
+import numpy as np
+
+from search_index import fold
+
+# =============================================
+# CONFIGURATION DE L'AUTOCOMPLETION
+# =============================================
+
+# Types de suggestions, dans l'ordre de préférence à score égal
+PROFESIONAL = "Profesional"
+ESPECIALIDAD = "Especialidad"
+SERVICIO = "Servicio"
+ARTICULO = "Artículo"
+TIPOS = (ESPECIALIDAD, PROFESIONAL, SERVICIO, ARTICULO)
+
+# Part minimale des trigrammes de la requête présents dans une suggestion
+MIN_OVERLAP = 0.5
+# Candidats repris pour le classement fin, par suggestion demandée
+RERANK_FACTOR = 8
+
+# =============================================
+# TRIGRAMMES
+# =============================================
+
+def trigrams(text, partial=False):
+    # "Pediatría" -> {"  p", " pe", "ped", ..., "ia "} ; le dernier mot d'une
+    # requête en cours de frappe (partial) n'a pas d'espace final
+    grams = set()
+    words = fold(text).split()
+    for n, word in enumerate(words):
+        padded = f"  {word}" if partial and n == len(words) - 1 else f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+# =============================================
+# INDEX
+# =============================================
+
+class SiteIndex:
+    def __init__(self, entries):
+        # entries : (tipo, libellé, détail, référence)
+        self.entries = tuple(entries)
+        self._labels = [fold(label) for _, label, _, _ in self.entries]
+        postings = {}
+        for i, (_, label, _, _) in enumerate(self.entries):
+            for gram in trigrams(label):
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        # Pénalité < 1 (un trigramme) : départage les égalités, les libellés
+        # courts et les types prioritaires d'abord
+        lengths = np.array([len(label) for label in self._labels], dtype=np.float64)
+        ranks = np.array([TIPOS.index(tipo) for tipo, _, _, _ in self.entries], dtype=np.float64)
+        self._penalty = np.minimum(lengths, 300) / 2000 + ranks / 20
+
+    def suggest(self, query, k=8):
+        grams = trigrams(query, partial=True)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not lists or not self.entries:
+            return []
+        # Nombre de trigrammes partagés par suggestion, vectorisé
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.entries))
+        threshold = max(1, int(np.ceil(len(grams) * MIN_OVERLAP)))
+        candidates = np.flatnonzero(counts >= threshold)
+        if not candidates.size:
+            return []
+        scores = counts[candidates] - self._penalty[candidates]
+        limit = k * RERANK_FACTOR
+        if candidates.size > limit:
+            keep = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[keep], scores[keep]
+
+        # Classement fin : préfixe exact, puis sous-chaîne, puis score
+        needle = fold(query).strip()
+        score_of = dict(zip(candidates.tolist(), scores.tolist()))
+        ranked = sorted(
+            score_of,
+            key=lambda i: (
+                not self._labels[i].startswith(needle),
+                needle not in self._labels[i],
+                -score_of[i],
+            )
+        )
+        return [self.entries[i] for i in ranked[:k]]
+
+
+# Tables indexées, lues ensemble (Catalog.snapshot)
+TABLAS = ("doctores", "especialidades", "servicios", "articulos")
+
+
+def catalog_entries(doctores, especialidades, servicios, articulos):
+    # Référence = ce qu'il faut pour réafficher l'élément choisi
+    for doctor in doctores:
+        yield PROFESIONAL, doctor.nombre, doctor.especialidad, doctor.id
+    for esp in especialidades:
+        yield ESPECIALIDAD, esp.nombre, "", esp.nombre
+    for servicio in servicios:
+        yield SERVICIO, servicio.title, "", servicio.id
+        for detalle in servicio.details:
+            yield SERVICIO, detalle, servicio.title, servicio.id
+    for articulo in articulos:
+        yield ARTICULO, articulo.titulo, articulo.categoria, articulo.id
+
+
+_INDEXES = {}
+
+
+def site_index(catalog):
+    # Un seul index par version du catalogue, partagé par toutes les sessions
+    version, *tablas = catalog.snapshot(*TABLAS)
+    index = _INDEXES.get(version)
+    if index is None:
+        index = SiteIndex(catalog_entries(*tablas))
+        _INDEXES.clear()
+        _INDEXES[version] = index
+    return index
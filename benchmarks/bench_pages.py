@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tomllib
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.toml")
+
+# =============================================
+# BANC D'ESSAI DES PAGES (AppTest)
+# =============================================
+# Usage : python benchmarks/bench_pages.py [--sizes 10 1000 50000] [--runs 30] [--check]
+#
+# Chaque taille de catalogue tourne dans un interpréteur neuf avec sa
+# propre base synthétique (MEDIPEDIDO_DATA_DIR). Les reruns sont chronométrés
+# sans tracemalloc ; une passe supplémentaire mesure le pic mémoire.
+
+SIZES = (10, 1000, 50000)
+RUNS = 30
+
+PAGINAS = {
+    "Inicio": ("paginas.inicio", "home_page"),
+    "Servicios": ("paginas.servicios", "servicios_page"),
+    "Profesionales": ("paginas.profesionales", "profesionales_page"),
+    "Blog": ("paginas.blog", "blog_page"),
+    "Contacto": ("paginas.contacto", "contacto_page"),
+}
+
+
+def _blog_search(at):
+    at.text_input(key="blog_search").input("salud presión")
+
+
+def _blog_category(at):
+    at.selectbox(key="blog_category").select("Nutrición")
+
+
+def _prof_filter(at):
+    at.selectbox(key="prof_especialidad").select("Pediatría")
+
+
+# Escenario -> (página, interacción aplicada antes de los reruns medidos)
+ESCENARIOS = {name: (name, None) for name in PAGINAS}
+ESCENARIOS.update({
+    "Blog: búsqueda": ("Blog", _blog_search),
+    "Blog: categoría": ("Blog", _blog_category),
+    "Profesionales: filtro": ("Profesionales", _prof_filter),
+})
+
+
+def _script(pagina):
+    module, function = PAGINAS[pagina]
+    return (
+        f"import sys\n"
+        f"sys.path.insert(0, {BASE_DIR!r})\n"
+        f"from componentes import setup_design\n"
+        f"from {module} import {function}\n"
+        f"setup_design()\n"
+        f"{function}()\n"
+    )
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+# =============================================
+# MESURE (interpréteur fils)
+# =============================================
+
+def _measure(runs):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for name, (pagina, interaction) in ESCENARIOS.items():
+        at = AppTest.from_string(_script(pagina), default_timeout=120)
+        start = time.perf_counter()
+        at.run()
+        cold = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception[0].message}")
+        if interaction is not None:
+            interaction(at)
+            at.run()
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        at.run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {
+            "cold_ms": round(cold * 1000, 2),
+            "p50_ms": round(percentile(timings, 50) * 1000, 2),
+            "p99_ms": round(percentile(timings, 99) * 1000, 2),
+            "peak_mb": round(peak / 2**20, 2),
+        }
+    # ru_maxrss est en kilo-octets sous Linux
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"escenarios": results, "rss_mb": round(rss_mb, 1)}))
+
+
+def run_size(size, runs):
+    with tempfile.TemporaryDirectory(prefix="medipedido-bench-") as data_dir:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import synthetic
+
+        synthetic.build(data_dir, size)
+        env = dict(os.environ, MEDIPEDIDO_DATA_DIR=data_dir)
+        output = subprocess.run(
+            [sys.executable, __file__, "--worker", "--runs", str(runs)],
+            cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+# =============================================
+# SEUILS DE REGRESSION
+# =============================================
+
+def check(report, path=THRESHOLDS):
+    with open(path, "rb") as f:
+        thresholds = tomllib.load(f)
+    failures = []
+    for size, result in report.items():
+        limits = thresholds.get(f"size_{size}", {})
+        if "rss_mb" in limits and result["rss_mb"] > limits["rss_mb"]:
+            failures.append(f"{size}: rss {result['rss_mb']} MB > {limits['rss_mb']} MB")
+        defaults = limits.get("default", {})
+        for name, values in result["escenarios"].items():
+            scenario = {**defaults, **limits.get(name, {})}
+            for metric, limit in scenario.items():
+                if values.get(metric, 0) > limit:
+                    failures.append(f"{size} / {name}: {metric} {values[metric]} > {limit}")
+    return failures
+
+
+def print_report(report):
+    print(f"{'tamaño':>8}  {'escenario':<24}{'frío ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'pico MB':>10}")
+    for size, result in report.items():
+        for name, values in result["escenarios"].items():
+            print(f"{size:>8}  {name:<24}{values['cold_ms']:>10.1f}{values['p50_ms']:>10.1f}"
+                  f"{values['p99_ms']:>10.1f}{values['peak_mb']:>10.2f}")
+        print(f"{size:>8}  {'RSS máximo del proceso':<24}{result['rss_mb']:>40.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de páginas MediPedido (AppTest)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--json", help="Guarda el informe en este archivo")
+    parser.add_argument("--check", action="store_true", help="Falla si se superan los umbrales")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _measure(args.runs)
+        sys.exit(0)
+
+    report = {}
+    for size in args.sizes:
+        report[size] = run_size(size, args.runs)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.check:
+        failures = check(report)
+        for failure in failures:
+            print(f"REGRESIÓN {failure}")
+        sys.exit(1 if failures else 0)
@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tomllib
+
+from bench_pages import BASE_DIR, THRESHOLDS, percentile
+from load_test import STREAM_PATH, _free_port, start_server
+
+# =============================================
+# RERUNS PARTIELS (st.fragment) CONTRE RERUNS COMPLETS
+# =============================================
+# Usage : python benchmarks/fragment_reruns.py [--size 1000] [--reruns 50] [--interactions Blog] [--check]
+#
+# L'application complète (MainFILE : design, navigation, recherche globale)
+# est servie, ouverte sur la page de l'interaction. La même saisie dans un
+# champ texte du fragment est rejouée N fois en rerun complet, puis N fois en
+# rerun du seul fragment (BackMsg rerun_script.fragment_id), comme le ferait
+# le navigateur. Pour chaque mode : latence (envoi -> script_finished),
+# octets et messages renvoyés, temps CPU du serveur par rerun (/proc, Linux).
+
+RERUNS = 50
+
+# Application minimale (un fragment, un champ) : coût fixe d'un rerun dans
+# le runtime Streamlit, à retrancher pour lire les autres lignes
+REFERENCIA = "Referencia"
+
+# Interaction -> (page, libellé du champ saisi dans le fragment, valeurs successives)
+INTERACCIONES = {
+    REFERENCIA: (None, "Buscar", ("a", "b")),
+    "Blog": ("Blog", "Buscar por palabras clave", ("salud", "presión", "niños", "estrés", "")),
+    "Profesionales": ("Profesionales", "Buscar por nombre", ("Laura", "García", "Dr", "")),
+    "Contacto": ("Contacto", "Nombre completo*", ("Ana", "Ana María", "Juan", "")),
+    "Búsqueda": ("Inicio", "Buscar", ("pedia", "cardio", "laura", "presión", "")),
+}
+
+MODOS = ("completo", "fragmento")
+
+
+def _app_script(pagina):
+    if pagina is None:
+        return (
+            "import streamlit as st\n"
+            "@st.fragment\n"
+            "def campo():\n"
+            "    st.text_input('Buscar')\n"
+            "campo()\n"
+        )
+    # option_menu n'a pas de navigateur pour changer d'onglet : page imposée
+    return (
+        f"import sys\n"
+        f"sys.path.insert(0, {BASE_DIR!r})\n"
+        f"import MainFILE\n"
+        f"from streamlit_option_menu import option_menu\n"
+        f"def _menu(*args, **kwargs):\n"
+        f"    kwargs['default_index'] = list(MainFILE.PAGINAS).index({pagina!r})\n"
+        f"    return option_menu(*args, **kwargs)\n"
+        f"MainFILE.option_menu = _menu\n"
+        f"MainFILE.main()\n"
+    )
+
+
+def cpu_seconds(pid):
+    # utime + stime de tous les threads du serveur
+    with open(f"/proc/{pid}/stat", encoding="ascii") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _rerun_msg(widget_id, value, fragment_id=None):
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    if widget_id is not None:
+        state = msg.rerun_script.widget_states.widgets.add()
+        state.id = widget_id
+        state.string_value = value
+    if fragment_id:
+        msg.rerun_script.fragment_id = fragment_id
+    return msg.SerializeToString()
+
+
+async def _until_finished(ws):
+    # -> (octets reçus, messages, ForwardMsg reçus)
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    received = messages = 0
+    parsed = []
+    while True:
+        raw = await ws.recv()
+        received += len(raw)
+        messages += 1
+        msg = ForwardMsg()
+        msg.ParseFromString(raw)
+        parsed.append(msg)
+        if msg.WhichOneof("type") == "script_finished":
+            if msg.script_finished not in (ForwardMsg.FINISHED_SUCCESSFULLY,
+                                           ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY):
+                raise RuntimeError(ForwardMsg.ScriptFinishedStatus.Name(msg.script_finished))
+            return received, messages, parsed
+
+
+def _find_widget(parsed, label):
+    # Identifiant du champ et du fragment qui le contient
+    for msg in parsed:
+        if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            continue
+        element = msg.delta.new_element
+        if element.WhichOneof("type") == "text_input" and element.text_input.label == label:
+            return element.text_input.id, msg.delta.fragment_id
+    raise RuntimeError(f"campo «{label}» no encontrado")
+
+
+async def _measure(url, pid, label, values, reruns):
+    from websockets.asyncio.client import connect
+
+    results = {}
+    async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        await ws.send(_rerun_msg(None, None))
+        _, _, parsed = await _until_finished(ws)
+        widget_id, fragment_id = _find_widget(parsed, label)
+        if not fragment_id:
+            raise RuntimeError(f"el campo «{label}» no está dentro de un fragmento")
+
+        for modo in MODOS:
+            timings, sizes, counts = [], [], []
+            cpu_start = cpu_seconds(pid)
+            for i in range(reruns):
+                payload = _rerun_msg(widget_id, values[i % len(values)],
+                                     fragment_id if modo == "fragmento" else None)
+                start = time.perf_counter()
+                await ws.send(payload)
+                received, messages, _ = await _until_finished(ws)
+                timings.append(time.perf_counter() - start)
+                sizes.append(received)
+                counts.append(messages)
+            cpu = cpu_seconds(pid) - cpu_start
+            results[modo] = {
+                "p50_ms": round(percentile(timings, 50) * 1000, 2),
+                "p99_ms": round(percentile(timings, 99) * 1000, 2),
+                "bytes_por_rerun": sum(sizes) // reruns,
+                "mensajes_por_rerun": sum(counts) // reruns,
+                "cpu_ms_por_rerun": round(cpu / reruns * 1000, 2),
+            }
+
+    completo, fragmento = results["completo"], results["fragmento"]
+    results["ratio"] = {
+        metric: round(fragmento[metric] / completo[metric], 3) if completo[metric] else 0.0
+        for metric in ("p50_ms", "bytes_por_rerun", "cpu_ms_por_rerun")
+    }
+    return results
+
+
+def run_interaction(nombre, data_dir, reruns):
+    pagina, label, values = INTERACCIONES[nombre]
+    script = os.path.join(data_dir, "app.py")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(_app_script(pagina))
+    port = _free_port()
+    # Sans surveillance des fichiers : le CPU mesuré est celui des reruns
+    env = dict(os.environ, MEDIPEDIDO_DATA_DIR=data_dir, STREAMLIT_SERVER_FILE_WATCHER_TYPE="none")
+    server = start_server(script, port, env)
+    try:
+        return asyncio.run(_measure(f"ws://127.0.0.1:{port}{STREAM_PATH}", server.pid, label, values, reruns))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def check(report, path=THRESHOLDS):
+    # Le rerun du fragment doit rester nettement moins cher que la page entière
+    with open(path, "rb") as f:
+        limits = tomllib.load(f).get("fragmentos", {})
+    failures = []
+    for nombre, result in report.items():
+        if nombre == REFERENCIA:
+            continue
+        scenario = {**limits.get("default", {}), **limits.get(nombre, {})}
+        for metric, value in result["ratio"].items():
+            limit = scenario.get(f"ratio_{metric}")
+            if limit is not None and value > limit:
+                failures.append(f"{nombre}: fragmento/completo {metric} {value} > {limit}")
+    return failures
+
+
+def print_report(report):
+    print(f"{'interacción':<15}{'modo':<11}{'p50 ms':>9}{'p99 ms':>9}{'bytes':>10}{'mensajes':>10}{'CPU ms':>9}")
+    for nombre, result in report.items():
+        for modo in MODOS:
+            values = result[modo]
+            print(f"{nombre:<15}{modo:<11}{values['p50_ms']:>9.1f}{values['p99_ms']:>9.1f}"
+                  f"{values['bytes_por_rerun']:>10}{values['mensajes_por_rerun']:>10}{values['cpu_ms_por_rerun']:>9.1f}")
+        ratio = result["ratio"]
+        print(f"{'':<15}{'ratio':<11}{ratio['p50_ms']:>9.2f}{'':>9}{ratio['bytes_por_rerun']:>10.2f}"
+              f"{'':>10}{ratio['cpu_ms_por_rerun']:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reruns de fragmento frente a reruns completos")
+    parser.add_argument("--size", type=int, default=1000, help="Catálogo sintético de este tamaño")
+    parser.add_argument("--reruns", type=int, default=RERUNS)
+    parser.add_argument("--interactions", nargs="+", choices=list(INTERACCIONES), default=list(INTERACCIONES))
+    parser.add_argument("--json", help="Guarda el informe en este archivo")
+    parser.add_argument("--check", action="store_true", help="Falla si se superan los umbrales")
+    args = parser.parse_args()
+
+    import synthetic
+
+    report = {}
+    with tempfile.TemporaryDirectory(prefix="medipedido-fragment-") as data_dir:
+        synthetic.build(data_dir, args.size)
+        for nombre in args.interactions:
+            report[nombre] = run_interaction(nombre, data_dir, args.reruns)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.check:
+        failures = check(report)
+        for failure in failures:
+            print(f"REGRESIÓN {failure}")
+        sys.exit(1 if failures else 0)
@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tomllib
+import urllib.request
+
+from bench_pages import BASE_DIR, PAGINAS, THRESHOLDS, _script, percentile
+
+# =============================================
+# TEST DE CHARGE (sessions concurrentes)
+# =============================================
+# Usage : python benchmarks/load_test.py [--sessions 50] [--reruns 20] [--page Blog] [--size 1000] [--check]
+#
+# Démarre un serveur Streamlit local, ouvre N websockets comme autant de
+# navigateurs et chronomètre chaque rerun : de l'envoi du BackMsg
+# rerun_script jusqu'au ForwardMsg script_finished.
+# Client websocket : paquet `websockets` (installé avec Streamlit).
+
+STREAM_PATH = "/_stcore/stream"
+HEALTH_PATH = "/_stcore/health"
+STARTUP_TIMEOUT = 60.0
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(script, port, env):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", script,
+         "--server.port", str(port), "--server.headless", "true",
+         "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit terminó con código {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{HEALTH_PATH}", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("streamlit no respondió a tiempo")
+
+# =============================================
+# SESSIONS
+# =============================================
+
+async def session(url, reruns, timings, errors):
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from websockets.asyncio.client import connect
+
+    rerun = BackMsg()
+    rerun.rerun_script.query_string = ""
+    payload = rerun.SerializeToString()
+    try:
+        async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            for _ in range(reruns):
+                start = time.perf_counter()
+                await ws.send(payload)
+                while True:
+                    msg = ForwardMsg()
+                    msg.ParseFromString(await ws.recv())
+                    if msg.WhichOneof("type") == "script_finished":
+                        break
+                if msg.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+                    errors.append(ForwardMsg.ScriptFinishedStatus.Name(msg.script_finished))
+                timings.append(time.perf_counter() - start)
+    except Exception as e:
+        errors.append(repr(e))
+
+
+async def load(url, sessions, reruns, ramp):
+    timings, errors = [], []
+    tasks = []
+    for _ in range(sessions):
+        tasks.append(asyncio.create_task(session(url, reruns, timings, errors)))
+        if ramp:
+            await asyncio.sleep(ramp / sessions)
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return timings, errors, time.perf_counter() - start
+
+
+def run(sessions, reruns, page=None, size=None, ramp=0.0):
+    with tempfile.TemporaryDirectory(prefix="medipedido-load-") as tmp:
+        env = dict(os.environ)
+        if size is not None:
+            import synthetic
+
+            synthetic.build(tmp, size)
+            env["MEDIPEDIDO_DATA_DIR"] = tmp
+        script = os.path.join(BASE_DIR, "MainFILE.py")
+        if page is not None:
+            script = os.path.join(tmp, "pagina.py")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write(_script(page))
+
+        port = _free_port()
+        server = start_server(script, port, env)
+        try:
+            timings, errors, elapsed = asyncio.run(
+                load(f"ws://127.0.0.1:{port}{STREAM_PATH}", sessions, reruns, ramp)
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    return {
+        "sesiones": sessions,
+        "reruns": len(timings),
+        "errores": len(errors),
+        "primeros_errores": errors[:5],
+        "reruns_por_segundo": round(len(timings) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(timings, 50) * 1000, 2),
+        "p99_ms": round(percentile(timings, 99) * 1000, 2),
+        "max_ms": round(max(timings, default=0.0) * 1000, 2),
+    }
+
+
+def check(report, path=THRESHOLDS):
+    with open(path, "rb") as f:
+        limits = tomllib.load(f).get("load", {})
+    failures = []
+    if report["errores"] > limits.get("errores", 0):
+        failures.append(f"errores {report['errores']} > {limits.get('errores', 0)}")
+    for metric in ("p50_ms", "p99_ms"):
+        if metric in limits and report[metric] > limits[metric]:
+            failures.append(f"{metric} {report[metric]} > {limits[metric]}")
+    if "reruns_por_segundo" in limits and report["reruns_por_segundo"] < limits["reruns_por_segundo"]:
+        failures.append(f"reruns_por_segundo {report['reruns_por_segundo']} < {limits['reruns_por_segundo']}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga de MediPedido")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--page", choices=list(PAGINAS), help="Sirve solo esta página (por defecto MainFILE.py)")
+    parser.add_argument("--size", type=int, help="Catálogo sintético de este tamaño")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Segundos para abrir todas las sesiones")
+    parser.add_argument("--check", action="store_true", help="Falla si se superan los umbrales")
+    args = parser.parse_args()
+
+    report = run(args.sessions, args.reruns, args.page, args.size, args.ramp)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.check:
+        failures = check(report)
+        for failure in failures:
+            print(f"REGRESIÓN {failure}")
+        sys.exit(1 if failures else 0)
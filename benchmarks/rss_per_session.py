@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_pages import BASE_DIR, PAGINAS, _script
+from load_test import STREAM_PATH, _free_port, start_server
+
+# =============================================
+# MEMOIRE PAR SESSION
+# =============================================
+# Usage : python benchmarks/rss_per_session.py [--size 1000] [--steps 1 25 50 100] [--page Profesionales]
+#
+# 1. RSS du serveur Streamlit (/proc/<pid>/status, Linux) à mesure que des
+#    sessions ouvertes s'accumulent : la pente donne le coût d'une session,
+#    l'ordonnée à l'origine le coût fixe du processus (catalogue compris).
+# 2. Mémoire du catalogue partagé, table par table (tracemalloc).
+
+# La première session charge le catalogue et les index : elle fait partie
+# du coût fixe, la pente se mesure à partir de là
+STEPS = (1, 25, 50, 100)
+SETTLE_SECONDS = 1.0
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def _open_session(url, ready, release):
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from websockets.asyncio.client import connect
+
+    rerun = BackMsg()
+    rerun.rerun_script.query_string = ""
+    async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        await ws.send(rerun.SerializeToString())
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await ws.recv())
+            if msg.WhichOneof("type") == "script_finished":
+                break
+        ready.release()
+        # La session reste ouverte (état conservé côté serveur) jusqu'à la fin
+        await release.wait()
+
+
+async def _measure(url, pid, steps):
+    ready = asyncio.Semaphore(0)
+    release = asyncio.Event()
+    tasks = []
+    rows = []
+    for target in steps:
+        new = max(0, target - len(tasks))
+        for _ in range(new):
+            tasks.append(asyncio.create_task(_open_session(url, ready, release)))
+        for _ in range(new):
+            await ready.acquire()
+        await asyncio.sleep(SETTLE_SECONDS)
+        rows.append((target, rss_mb(pid)))
+    release.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return rows
+
+
+def sessions_report(size, steps, page=None):
+    with tempfile.TemporaryDirectory(prefix="medipedido-rss-") as tmp:
+        env = dict(os.environ)
+        if size is not None:
+            import synthetic
+
+            synthetic.build(tmp, size)
+            env["MEDIPEDIDO_DATA_DIR"] = tmp
+        script = os.path.join(BASE_DIR, "MainFILE.py")
+        if page is not None:
+            script = os.path.join(tmp, "pagina.py")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write(_script(page))
+        port = _free_port()
+        server = start_server(script, port, env)
+        try:
+            rows = asyncio.run(_measure(f"ws://127.0.0.1:{port}{STREAM_PATH}", server.pid, sorted(steps)))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    # Régression linéaire RSS = base + pente * sesiones
+    n = len(rows)
+    mean_x = sum(x for x, _ in rows) / n
+    mean_y = sum(y for _, y in rows) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in rows)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in rows) / var_x if var_x else 0.0
+    return {
+        "mediciones": [{"sesiones": x, "rss_mb": round(y, 1)} for x, y in rows],
+        "mb_por_sesion": round(slope, 3),
+        "mb_base": round(mean_y - slope * mean_x, 1),
+    }
+
+
+def _catalog_worker():
+    # Interpréteur neuf : seul le catalogue est mesuré
+    import tracemalloc
+
+    sys.path.insert(0, BASE_DIR)
+    import catalog
+
+    result = {}
+    cat = catalog.get_catalog()
+    cat.version()
+    for name in catalog.TABLES:
+        tracemalloc.start()
+        table = cat.table(name)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result[name] = {"filas": len(table.records), "mb": round(current / 2**20, 2)}
+    print(json.dumps(result))
+
+
+def catalog_report(size):
+    with tempfile.TemporaryDirectory(prefix="medipedido-rss-") as tmp:
+        import synthetic
+
+        synthetic.build(tmp, size)
+        output = subprocess.run(
+            [sys.executable, __file__, "--catalog-worker"],
+            cwd=BASE_DIR, env=dict(os.environ, MEDIPEDIDO_DATA_DIR=tmp),
+            capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memoria por sesión de MediPedido")
+    parser.add_argument("--size", type=int, default=1000, help="Catálogo sintético de este tamaño")
+    parser.add_argument("--steps", type=int, nargs="+", default=list(STEPS))
+    parser.add_argument("--page", choices=list(PAGINAS), help="Sirve solo esta página (por defecto MainFILE.py)")
+    parser.add_argument("--catalog-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.catalog_worker:
+        _catalog_worker()
+        sys.exit(0)
+
+    report = {
+        "catalogo": catalog_report(args.size),
+        "sesiones": sessions_report(args.size, args.steps, args.page),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
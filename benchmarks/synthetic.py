@@ -0,0 +1,83 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import catalog  # noqa: E402
+
+# =============================================
+# CATALOGUES SYNTHETIQUES
+# =============================================
+
+PALABRAS = (
+    "salud presión arterial nutrición infantil estrés ansiedad sueño corazón "
+    "prevención vacunas diabetes colesterol ejercicio alimentación embarazo "
+    "pediatría geriatría dermatología alergias migraña espalda articulaciones "
+    "hidratación bienestar control tratamiento síntomas hábitos familia"
+).split()
+
+CATEGORIAS = ("Prevención", "Tratamientos", "Salud Mental", "Nutrición")
+UNIVERSIDADES = ("UBA", "UNC", "UNLP", "UNR", "UNCuyo", "UAI")
+NOMBRES = ("Laura", "Carlos", "Ana", "Javier", "Marcos", "Lucía", "Sofía", "Martín", "Valeria", "Diego")
+APELLIDOS = ("Méndez", "Rodríguez", "García", "Pérez", "Fernández", "López", "Gómez", "Díaz", "Romero", "Sosa")
+
+
+def _frase(rng, n):
+    return " ".join(rng.choice(PALABRAS) for _ in range(n))
+
+
+def doctores(n, rng):
+    especialidades = [e["nombre"] for e in catalog.SEED["especialidades"]]
+    return [
+        {
+            "matricula": f"MN {100000 + i}",
+            "nombre": f"{rng.choice(('Dr.', 'Dra.'))} {rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {i}",
+            "especialidad": rng.choice(especialidades),
+            "exp": rng.randint(1, 40),
+            "universidad": rng.choice(UNIVERSIDADES),
+            "img": catalog.SEED["doctores"][i % 3]["img"],
+            "lat": rng.uniform(-34.75, -34.50),
+            "lon": rng.uniform(-58.55, -58.33),
+        }
+        for i in range(n)
+    ]
+
+
+def articulos(n, rng):
+    return [
+        {
+            "slug": f"articulo-{i}",
+            "titulo": _frase(rng, 6).capitalize(),
+            "autor": f"{rng.choice(('Dr.', 'Dra.'))} {rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}",
+            "fecha": f"20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "categoria": rng.choice(CATEGORIAS),
+            "resumen": _frase(rng, 25).capitalize() + ".",
+            "imagen": catalog.SEED["articulos"][i % 3]["imagen"],
+            "tags": [_frase(rng, 2) for _ in range(3)],
+            "tiempo_lectura": f"{rng.randint(3, 15)} min",
+        }
+        for i in range(n)
+    ]
+
+
+def build(data_dir, size, seed=0):
+    # Base catalogo.db avec `size` médecins et `size` articles
+    rng = random.Random(seed)
+    path = os.path.join(data_dir, "catalogo.db")
+    if os.path.exists(path):
+        os.remove(path)
+    catalog.init_db(path, seed=False)
+    conn = catalog.connect(path)
+    with conn:
+        for table in ("especialidades", "servicios", "pasos"):
+            catalog.insert_rows(conn, table, catalog.SEED[table])
+        catalog.insert_rows(conn, "doctores", doctores(size, rng))
+        catalog.insert_rows(conn, "articulos", articulos(size, rng))
+    conn.close()
+    return path
+
+
+if __name__ == "__main__":
+    directory, size = sys.argv[1], int(sys.argv[2])
+    print(build(directory, size))
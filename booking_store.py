@@ -0,0 +1,92 @@
+import datetime
+import os
+import sqlite3
+import threading
+
+# =============================================
+# CONFIGURATION
+# =============================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get("MEDIPEDIDO_DATA_DIR", os.path.join(BASE_DIR, "data"))
+DB_PATH = os.path.join(DATA_DIR, "citas.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS citas (
+    id INTEGER PRIMARY KEY,
+    creada TEXT NOT NULL,
+    doctor_id INTEGER NOT NULL,
+    inicio TEXT NOT NULL,
+    minutos INTEGER NOT NULL,
+    paciente TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_citas_inicio ON citas (inicio);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_citas_turno ON citas (doctor_id, inicio);
+-- Un renglón por créneau occupé : la clé primaire interdit deux rendez-vous
+-- qui se chevauchent, même pris par deux processus différents
+CREATE TABLE IF NOT EXISTS turnos (
+    doctor_id INTEGER NOT NULL,
+    inicio TEXT NOT NULL,
+    cita_id INTEGER NOT NULL REFERENCES citas (id),
+    PRIMARY KEY (doctor_id, inicio)
+) WITHOUT ROWID;
+"""
+
+# =============================================
+# RENDEZ-VOUS CONFIRMES
+# =============================================
+# Écriture synchrone : la confirmation n'est affichée qu'une fois le
+# rendez-vous enregistré. Une ligne par réservation, rare face aux lectures.
+# La base arbitre entre processus : le verrou de l'agenda ne vaut que pour
+# le processus courant.
+
+class BookingStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(self, doctor_id, inicio, minutos, paciente, paso):
+        # False si un des créneaux (de paso minutes) est déjà pris
+        creada = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        turnos = [inicio + datetime.timedelta(minutes=m) for m in range(0, minutos, paso)]
+        try:
+            with self._lock, self._conn:
+                cita_id = self._conn.execute(
+                    "INSERT INTO citas (creada, doctor_id, inicio, minutos, paciente) VALUES (?, ?, ?, ?, ?)",
+                    (creada, doctor_id, inicio.isoformat(timespec="minutes"), minutos, paciente)
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO turnos (doctor_id, inicio, cita_id) VALUES (?, ?, ?)",
+                    [(doctor_id, turno.isoformat(timespec="minutes"), cita_id) for turno in turnos]
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def upcoming(self, desde, doctor_id=None):
+        # -> (doctor_id, inicio, minutos) des rendez-vous à partir de desde
+        query = "SELECT doctor_id, inicio, minutos FROM citas WHERE inicio >= ?"
+        params = (desde.isoformat(timespec="minutes"),)
+        if doctor_id is not None:
+            query += " AND doctor_id = ?"
+            params += (doctor_id,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY inicio", params).fetchall()
+        return [(doctor_id, datetime.datetime.fromisoformat(inicio), minutos) for doctor_id, inicio, minutos in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bookings():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BookingStore()
+    return _store
@@ -0,0 +1,480 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# =============================================
+# CONFIGURATION DU CATALOGUE
+# =============================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get("MEDIPEDIDO_DATA_DIR", os.path.join(BASE_DIR, "data"))
+DB_PATH = os.path.join(DATA_DIR, "catalogo.db")
+
+# Intervalle minimal entre deux vérifications de la date de modification
+CHECK_INTERVAL = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS doctores (
+    id INTEGER PRIMARY KEY,
+    matricula TEXT UNIQUE NOT NULL,
+    nombre TEXT NOT NULL,
+    especialidad TEXT NOT NULL,
+    exp INTEGER NOT NULL,
+    universidad TEXT,
+    img TEXT,
+    lat REAL,
+    lon REAL
+);
+CREATE INDEX IF NOT EXISTS idx_doctores_especialidad ON doctores (especialidad);
+
+CREATE TABLE IF NOT EXISTS especialidades (
+    nombre TEXT PRIMARY KEY,
+    icon TEXT,
+    orden INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS servicios (
+    id INTEGER PRIMARY KEY,
+    icon TEXT,
+    title TEXT NOT NULL,
+    "desc" TEXT,
+    details TEXT
+);
+
+CREATE TABLE IF NOT EXISTS pasos (
+    orden INTEGER PRIMARY KEY,
+    icon TEXT,
+    title TEXT NOT NULL,
+    "desc" TEXT
+);
+
+CREATE TABLE IF NOT EXISTS articulos (
+    id INTEGER PRIMARY KEY,
+    slug TEXT UNIQUE NOT NULL,
+    titulo TEXT NOT NULL,
+    autor TEXT,
+    fecha TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    resumen TEXT,
+    imagen TEXT,
+    tags TEXT,
+    tiempo_lectura TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articulos_categoria ON articulos (categoria);
+CREATE INDEX IF NOT EXISTS idx_articulos_fecha ON articulos (fecha);
+
+-- Horario de atención por día (0 = lunes), en minutos desde medianoche
+CREATE TABLE IF NOT EXISTS horarios (
+    doctor_id INTEGER NOT NULL REFERENCES doctores (id),
+    dia INTEGER NOT NULL,
+    inicio INTEGER NOT NULL,
+    fin INTEGER NOT NULL,
+    PRIMARY KEY (doctor_id, dia, inicio)
+);
+"""
+
+# Enregistrements immuables adossés à des tuples (sans __dict__) :
+# chargés une fois, partagés tels quels par toutes les sessions
+Doctor = namedtuple("Doctor", ("id", "matricula", "nombre", "especialidad", "exp", "universidad", "img", "lat", "lon"))
+Especialidad = namedtuple("Especialidad", ("nombre", "icon", "orden"))
+Servicio = namedtuple("Servicio", ("id", "icon", "title", "desc", "details"))
+Paso = namedtuple("Paso", ("orden", "icon", "title", "desc"))
+Articulo = namedtuple("Articulo", ("id", "slug", "titulo", "autor", "fecha", "categoria", "resumen",
+                                   "imagen", "tags", "tiempo_lectura"))
+Horario = namedtuple("Horario", ("doctor_id", "dia", "inicio", "fin"))
+
+# Type d'enregistrement, tri, colonnes JSON, colonnes internées (valeurs
+# très répétées), index par valeur et index ordonnés (requêtes par intervalle)
+TABLES = {
+    "doctores": (Doctor, "id", (), ("especialidad", "universidad", "img"), ("especialidad",), ("exp",)),
+    "especialidades": (Especialidad, "orden", (), ("nombre", "icon"), (), ()),
+    "servicios": (Servicio, "id", ("details",), ("icon",), (), ()),
+    "pasos": (Paso, "orden", (), ("icon",), (), ()),
+    "articulos": (Articulo, "fecha DESC, id", ("tags",), ("autor", "categoria", "imagen", "tags", "tiempo_lectura"),
+                  ("categoria",), ("fecha",)),
+    "horarios": (Horario, "doctor_id, dia, inicio", (), (), (), ()),
+}
+
+# Version de chaque table, incrémentée par trigger à chaque écriture (import,
+# script, édition à la main) : un import du plantel n'invalide pas les index
+# du blog. Une base neuve part de l'horloge, pas de 0 : un fichier remplacé
+# ne réutilise pas les versions de l'ancien
+VERSIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versiones (
+    tabla TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+""" + "".join(
+    f"CREATE TRIGGER IF NOT EXISTS version_{name}_{op.lower()} AFTER {op} ON {name} "
+    f"BEGIN UPDATE versiones SET version = version + 1 WHERE tabla = '{name}'; END;\n"
+    for name in TABLES for op in ("INSERT", "UPDATE", "DELETE")
+)
+
+# =============================================
+# CONTENU INITIAL
+# =============================================
+
+SEED = {
+    "doctores": [
+        {
+            "matricula": "MN 104512",
+            "nombre": "Dra. Laura Méndez",
+            "especialidad": "Pediatría",
+            "exp": 12,
+            "universidad": "UBA",
+            "img": "https://images.unsplash.com/photo-1559839734-2b71ea197ec2?ixlib=rb-1.2.1&auto=format&fit=crop&w=500&q=80",
+            "lat": -34.5889,
+            "lon": -58.4306
+        },
+        {
+            "matricula": "MN 098133",
+            "nombre": "Dr. Carlos Rodríguez",
+            "especialidad": "Cardiología",
+            "exp": 18,
+            "universidad": "UNC",
+            "img": "https://images.unsplash.com/photo-1622253692010-333f2da6031d?ixlib=rb-1.2.1&auto=format&fit=crop&w=500&q=80",
+            "lat": -34.6186,
+            "lon": -58.4420
+        },
+        {
+            "matricula": "MN 101877",
+            "nombre": "Dra. Ana García",
+            "especialidad": "Geriatría",
+            "exp": 15,
+            "universidad": "UNLP",
+            "img": "https://images.unsplash.com/photo-1594824476967-48c8b964273f?ixlib=rb-1.2.1&auto=format&fit=crop&w=500&q=80",
+            "lat": -34.5627,
+            "lon": -58.4565
+        }
+    ],
+    "especialidades": [
+        {"nombre": "Medicina General", "icon": "🩺", "orden": 1},
+        {"nombre": "Pediatría", "icon": "👶", "orden": 2},
+        {"nombre": "Cardiología", "icon": "❤️", "orden": 3},
+        {"nombre": "Neurología", "icon": "🧠", "orden": 4},
+        {"nombre": "Dermatología", "icon": "🌟", "orden": 5},
+        {"nombre": "Ginecología", "icon": "🌸", "orden": 6},
+        {"nombre": "Traumatología", "icon": "🦴", "orden": 7},
+        {"nombre": "Psiquiatría", "icon": "🧠", "orden": 8},
+        {"nombre": "Nutrición", "icon": "🍎", "orden": 9}
+    ],
+    "servicios": [
+        {
+            "icon": "🏠",
+            "title": "Consultas a Domicilio",
+            "desc": "Médicos generales y especialistas que acuden a tu hogar u oficina.",
+            "details": [
+                "Exámenes físicos completos",
+                "Diagnósticos precisos",
+                "Recetas médicas electrónicas",
+                "Atención preventiva"
+            ]
+        },
+        {
+            "icon": "💻",
+            "title": "Telemedicina",
+            "desc": "Consultas virtuales con especialistas desde cualquier lugar.",
+            "details": [
+                "Videollamadas HD seguras",
+                "Segundas opiniones médicas",
+                "Control continuo de tratamientos",
+                "Resultados en línea"
+            ]
+        },
+        {
+            "icon": "🩺",
+            "title": "Servicios Especializados",
+            "desc": "Atención de especialidades médicas en tu domicilio.",
+            "details": [
+                "Pediatría y neonatología",
+                "Cardiología avanzada",
+                "Neurología y psiquiatría",
+                "Geriatría y cuidados paliativos"
+            ]
+        }
+    ],
+    "pasos": [
+        {"orden": 1, "icon": "📱", "title": "Solicita una cita", "desc": "Por app, web o llamada telefónica"},
+        {"orden": 2, "icon": "⏰", "title": "Confirma horario", "desc": "Recibe confirmación inmediata"},
+        {"orden": 3, "icon": "🚑", "title": "Médico en camino", "desc": "Profesional certificado se dirige a ti"},
+        {"orden": 4, "icon": "🏠", "title": "Atención personalizada", "desc": "Consulta completa en tu domicilio"}
+    ],
+    "articulos": [
+        {
+            "slug": "controlar-presion-arterial-en-casa",
+            "titulo": "Cómo controlar la presión arterial en casa",
+            "autor": "Dr. Javier Mendoza",
+            "fecha": "2023-05-15",
+            "categoria": "Prevención",
+            "resumen": "Aprende técnicas efectivas para monitorear tu presión arterial y prevenir complicaciones cardiovasculares con recomendaciones de expertos.",
+            "imagen": "https://images.unsplash.com/photo-1579684385127-1ef15d508118?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80",
+            "tags": ["hipertensión", "salud cardiovascular", "prevención"],
+            "tiempo_lectura": "5 min"
+        },
+        {
+            "slug": "alimentacion-saludable-ninos",
+            "titulo": "Alimentación saludable para niños en crecimiento",
+            "autor": "Dra. Laura Fernández",
+            "fecha": "2023-06-02",
+            "categoria": "Nutrición",
+            "resumen": "Guía completa de nutrición infantil con recomendaciones por edades y cómo abordar necesidades especiales en cada etapa del desarrollo.",
+            "imagen": "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80",
+            "tags": ["nutrición infantil", "crecimiento", "alimentación saludable"],
+            "tiempo_lectura": "8 min"
+        },
+        {
+            "slug": "manejo-del-estres",
+            "titulo": "Manejo del estrés en tiempos modernos",
+            "autor": "Dr. Marcos Pérez",
+            "fecha": "2023-04-10",
+            "categoria": "Salud Mental",
+            "resumen": "Estrategias validadas por psicólogos para gestionar el estrés laboral y personal en el acelerado mundo actual.",
+            "imagen": "https://images.unsplash.com/photo-1491841550275-ad7854e35ca6?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80",
+            "tags": ["estrés", "salud mental", "bienestar"],
+            "tiempo_lectura": "6 min"
+        }
+    ],
+}
+
+# =============================================
+# CREATION DE LA BASE
+# =============================================
+
+def connect(path=DB_PATH):
+    return sqlite3.connect(path, timeout=30)
+
+
+def insert_rows(conn, table, rows):
+    if not rows:
+        return
+    columns = list(rows[0])
+    names = ", ".join(f'"{c}"' for c in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(
+        f"INSERT INTO {table} ({names}) VALUES ({placeholders})",
+        [
+            tuple(json.dumps(v, ensure_ascii=False) if isinstance(v, list) else v
+                  for v in (row[c] for c in columns))
+            for row in rows
+        ]
+    )
+
+
+def _migrate(conn):
+    # Ajoute les colonnes apparues depuis la création de la base
+    for table, columns in (("doctores", (("lat", "REAL"), ("lon", "REAL"))),):
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, kind in columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+
+
+def init_db(path=DB_PATH, seed=True):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with connect(path) as conn:
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        conn.executescript(VERSIONS_SCHEMA)
+        conn.executemany("INSERT OR IGNORE INTO versiones (tabla, version) VALUES (?, ?)",
+                         [(name, time.time_ns()) for name in TABLES])
+        if seed and conn.execute("SELECT COUNT(*) FROM doctores").fetchone()[0] == 0:
+            for table, rows in SEED.items():
+                insert_rows(conn, table, rows)
+    conn.close()
+
+# =============================================
+# CHARGEMENT ET INVALIDATION
+# =============================================
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, tuple):
+        return tuple(map(sys.intern, value))
+    return value
+
+
+def load_records(conn, name):
+    record, order, json_columns, interned_columns, _, _ = TABLES[name]
+    names = ", ".join(f'"{c}"' for c in record._fields)
+    json_positions = [record._fields.index(c) for c in json_columns]
+    interned_positions = [record._fields.index(c) for c in interned_columns]
+    records = []
+    for row in conn.execute(f"SELECT {names} FROM {name} ORDER BY {order}"):
+        values = list(row)
+        for i in json_positions:
+            values[i] = tuple(json.loads(values[i])) if values[i] else ()
+        for i in interned_positions:
+            values[i] = _intern(values[i])
+        records.append(record._make(values))
+    return tuple(records)
+
+
+class Table:
+    def __init__(self, records, indexed_columns, range_columns, version=None):
+        self.records = records
+        self.version = version
+        self.indexes = {}
+        for column in indexed_columns:
+            index = {}
+            for i, record in enumerate(records):
+                index.setdefault(getattr(record, column), []).append(i)
+            self.indexes[column] = {value: tuple(positions) for value, positions in index.items()}
+        self.ranges = {}
+        for column in range_columns:
+            order = sorted(range(len(records)), key=lambda i: getattr(records[i], column))
+            keys = [getattr(records[i], column) for i in order]
+            self.ranges[column] = (keys, order)
+        # Position de chaque enregistrement par identifiant
+        self.positions = {}
+        if records and hasattr(records[0], "id"):
+            self.positions = {record.id: i for i, record in enumerate(records)}
+
+    def where(self, column, value):
+        positions = self.indexes[column].get(value, ())
+        return tuple(self.records[i] for i in positions)
+
+    def between(self, column, low=None, high=None):
+        keys, order = self.ranges[column]
+        start = 0 if low is None else bisect_left(keys, low)
+        end = len(keys) if high is None else bisect_right(keys, high)
+        return sorted(order[start:end])
+
+
+class Catalog:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._tables = {}
+        self._mtime = None
+        self._versions = {}
+        self._checked_at = 0.0
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        if self._mtime is None:
+            # Premier accès du processus : création ou mise à niveau du schéma
+            init_db(self.path)
+        mtime = self._current_mtime()
+        if mtime != self._mtime:
+            # Le fichier a été modifié : seules les tables dont la version a
+            # changé sont rechargées (à la demande)
+            conn = connect(self.path)
+            try:
+                self._versions = dict(conn.execute("SELECT tabla, version FROM versiones"))
+            finally:
+                conn.close()
+            self._tables = {name: table for name, table in self._tables.items()
+                            if table.version == self._versions.get(name)}
+            self._mtime = mtime
+
+    def _table(self, name):
+        # Appelé sous self._lock
+        table = self._tables.get(name)
+        if table is None:
+            _, _, _, _, indexed_columns, range_columns = TABLES[name]
+            conn = connect(self.path)
+            try:
+                # Version et enregistrements lus dans la même transaction
+                conn.execute("BEGIN")
+                row = conn.execute("SELECT version FROM versiones WHERE tabla = ?", (name,)).fetchone()
+                records = load_records(conn, name)
+            finally:
+                conn.close()
+            table = Table(records, indexed_columns, range_columns, row[0] if row else None)
+            self._tables[name] = table
+        return table
+
+    def table(self, name):
+        with self._lock:
+            self._refresh()
+            return self._table(name)
+
+    def version(self):
+        with self._lock:
+            self._refresh()
+            return ",".join(f"{name}:{version}" for name, version in sorted(self._versions.items()))
+
+    def snapshot(self, *names):
+        # (version, enregistrements de chaque table) lus sous le même verrou.
+        # La version ne dépend que des tables demandées, et chacune est celle
+        # des enregistrements chargés : un index mis en cache pour une version
+        # est toujours construit à partir des enregistrements de cette version
+        with self._lock:
+            self._refresh()
+            tables = [self._table(name) for name in names]
+        version = ",".join(f"{name}:{table.version}" for name, table in zip(names, tables))
+        return (version,) + tuple(table.records for table in tables)
+
+    # -- Consultas --------------------------------
+
+    def doctores(self, especialidad=None):
+        table = self.table("doctores")
+        if especialidad is None:
+            return table.records
+        return table.where("especialidad", especialidad)
+
+    def doctor(self, doctor_id):
+        table = self.table("doctores")
+        position = table.positions.get(doctor_id)
+        return None if position is None else table.records[position]
+
+    def articulo(self, articulo_id):
+        table = self.table("articulos")
+        position = table.positions.get(articulo_id)
+        return None if position is None else table.records[position]
+
+    def especialidades(self):
+        return self.table("especialidades").records
+
+    def servicios(self):
+        return self.table("servicios").records
+
+    def pasos(self):
+        return self.table("pasos").records
+
+    def articulos(self, categoria=None, desde=None, hasta=None):
+        table = self.table("articulos")
+        if desde is None and hasta is None:
+            return table.records if categoria is None else table.where("categoria", categoria)
+        positions = table.between("fecha", desde, hasta)
+        if categoria is not None:
+            allowed = table.indexes["categoria"].get(categoria, ())
+            positions = sorted(set(positions).intersection(allowed))
+        return tuple(table.records[i] for i in positions)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    # Un seul catalogue par processus, partagé par toutes les sessions
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = Catalog()
+    return _catalog
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["init"]:
+        init_db()
+        print(f"Catálogo inicializado en {DB_PATH}")
+    else:
+        print("Uso: python catalog.py init")
@@ -0,0 +1,277 @@
+import datetime
+from html import escape
+
+import streamlit as st
+
+from agenda import get_agenda
+from assets import stylesheet_tag
+from catalog import get_catalog
+from images import image_src
+from metrics import count_builder, measured_fragment
+from templates import Markup, Template
+
+# =============================================
+# CONFIGURATION PARTAGEE
+# =============================================
+
+# Duración de una cita
+DURACION_CITA = 2  # créneaux de 15 minutes
+
+# Sugerencias del buscador global
+SUGERENCIAS = 8
+
+MESES = ("Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+         "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre")
+
+catalog = get_catalog()
+
+
+def current_agenda():
+    # Agenda con los horarios importados de la versión vigente del catálogo:
+    # reservas y envíos a domicilio ven las mismas horas de atención
+    agenda = get_agenda()
+    version, horarios = catalog.snapshot("horarios")
+    agenda.load_schedules(version, horarios)
+    return agenda
+
+# =============================================
+# FONCTIONS DE DESIGN
+# =============================================
+
+def setup_design():
+    # Feuille de style statique, hashée : le navigateur la garde en cache
+    st.markdown(stylesheet_tag(), unsafe_allow_html=True)
+
+# =============================================
+# COMPOSANTS REUTILISABLES
+# =============================================
+
+PAGE_HEADER = Template("""
+<div class="page-header {variant}">
+<h1>{titulo}</h1>
+<p>{subtitulo}</p>
+</div>
+""")
+
+SECTION_HEADING = Template("""
+<div class="section-heading {variant}">
+<h2>{titulo}</h2>
+</div>
+""")
+
+DOCTOR_CARD = Template("""
+<div class="card doctor-card animate-in" style="animation-delay: {delay}ms">
+<img src="{img_url}" class="doctor-img" width="160" height="160" loading="lazy" decoding="async">
+<h3 class="doctor-name">{name}</h3>
+<p class="doctor-specialty">{specialty}</p>
+<p class="doctor-exp">{experience} años de experiencia</p>
+</div>
+""")
+
+STAT_CARD = Template("""
+<div class="card stat-card">
+<div class="stat-icon">{icon}</div>
+<h2 class="stat-value">{value}</h2>
+<p class="stat-label">{label}</p>
+</div>
+""")
+
+SERVICE_ITEM = Template('<li>{item}</li>')
+
+SERVICE_CARD = Template("""
+<div class="card animate-in" style="animation-delay: {delay}ms">
+<div class="service-icon">{icon}</div>
+<h2 class="service-title">{title}</h2>
+<p class="service-desc">{desc}</p>
+<ul class="service-details">{details}</ul>
+</div>
+""")
+
+PASO_CARD = Template("""
+<div class="card step-card">
+<div class="step-icon">{icon}</div>
+<h3>{title}</h3>
+<p>{desc}</p>
+</div>
+""")
+
+ESPECIALIDAD_CARD = Template("""
+<div class="card specialty-card">
+<div class="specialty-icon">{icon}</div>
+<h3>{nombre}</h3>
+</div>
+""")
+
+ARTICLE_TAG = Template('<span class="tag">{tag}</span>')
+
+ARTICLE_CARD = Template("""
+<div class="card animate-in" style="animation-delay: {delay}ms">
+<div class="article-layout">
+<div class="article-media"><img src="{imagen}" loading="lazy" decoding="async"></div>
+<div class="article-body">
+<div class="article-meta">
+<span class="article-category">{categoria}</span>
+<span class="muted">{fecha} • {tiempo_lectura}</span>
+</div>
+<h2 class="article-title">{titulo}</h2>
+<p class="article-summary">{resumen}</p>
+<div class="article-tags">{tags}</div>
+<div class="article-footer">
+<span class="muted">Por {autor}</span>
+</div>
+</div>
+</div>
+</div>
+""")
+
+# Cabecera y pie de la ficha en el caché de plantillas; el cuerpo del
+# artículo (grande, ya en caché en article_bodies) se inserta entre ambos
+ARTICLE_DETAIL_HEAD = Template("""
+<div class="card article-detail">
+<div class="article-meta">
+<span class="article-category">{categoria}</span>
+<span class="muted">{fecha} • {tiempo_lectura} • Por {autor}</span>
+</div>
+<h1 class="article-title">{titulo}</h1>
+<img src="{imagen}" class="article-hero" decoding="async">
+<div class="article-content">""")
+
+ARTICLE_DETAIL_TAIL = Template("""</div>
+<div class="article-tags">{tags}</div>
+</div>
+""")
+
+def _change_page(key, delta):
+    st.session_state[key] = st.session_state.get(key, 0) + delta
+
+def pagination_controls(key, page, has_next):
+    if page == 0 and not has_next:
+        return
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("← Anterior", key=f"{key}_prev", disabled=page == 0,
+                  on_click=_change_page, args=(key, -1))
+    with col2:
+        st.markdown(f"<p class='page-indicator'>Página {page + 1}</p>",
+                    unsafe_allow_html=True)
+    with col3:
+        st.button("Siguiente →", key=f"{key}_next", disabled=not has_next,
+                  on_click=_change_page, args=(key, 1))
+
+def fecha_larga(iso):
+    # "2023-05-15" -> "15 Mayo 2023"
+    fecha = datetime.date.fromisoformat(iso)
+    return f"{fecha.day} {MESES[fecha.month - 1]} {fecha.year}"
+
+def doctor_card(name, specialty, experience, img_url, delay=0):
+    count_builder("doctor_card")
+    return DOCTOR_CARD.render(
+        name=name,
+        specialty=specialty,
+        experience=experience,
+        img_url=image_src(img_url, "doctor"),
+        delay=delay
+    )
+
+def service_card(servicio, delay=0):
+    count_builder("service_card")
+    return SERVICE_CARD.render(
+        icon=servicio.icon,
+        title=servicio.title,
+        desc=servicio.desc,
+        details=SERVICE_ITEM.render_each("item", servicio.details),
+        delay=delay
+    )
+
+def article_detail(articulo, contenido):
+    # contenido : HTML del cuerpo (Markup); un str se escapa
+    count_builder("article_detail")
+    cabecera = ARTICLE_DETAIL_HEAD.render(
+        imagen=image_src(articulo.imagen, "articulo_detalle"),
+        categoria=articulo.categoria,
+        fecha=fecha_larga(articulo.fecha),
+        tiempo_lectura=articulo.tiempo_lectura,
+        titulo=articulo.titulo,
+        autor=articulo.autor
+    )
+    if not isinstance(contenido, Markup):
+        contenido = escape(contenido)
+    pie = ARTICLE_DETAIL_TAIL.render(tags=ARTICLE_TAG.render_each("tag", articulo.tags))
+    return Markup(cabecera + contenido + pie)
+
+def article_card(articulo, delay=0):
+    count_builder("article_card")
+    return ARTICLE_CARD.render(
+        imagen=image_src(articulo.imagen, "articulo"),
+        categoria=articulo.categoria,
+        fecha=fecha_larga(articulo.fecha),
+        tiempo_lectura=articulo.tiempo_lectura,
+        titulo=articulo.titulo,
+        resumen=articulo.resumen,
+        tags=ARTICLE_TAG.render_each("tag", articulo.tags),
+        autor=articulo.autor,
+        delay=delay
+    )
+
+# =============================================
+# RECHERCHE GLOBALE
+# =============================================
+
+def _choose_suggestion(tipo, referencia):
+    st.session_state["busqueda_sel"] = (tipo, referencia)
+    st.session_state["busqueda_q"] = ""
+
+def _close_selection():
+    st.session_state.pop("busqueda_sel", None)
+
+def _show_selection(tipo, referencia):
+    # L'index (numpy) n'est importé qu'à la première recherche
+    from autocomplete import ARTICULO, ESPECIALIDAD, PROFESIONAL, SERVICIO
+
+    html = None
+    if tipo == PROFESIONAL:
+        doctor = catalog.doctor(referencia)
+        if doctor is not None:
+            html = doctor_card(name=doctor.nombre, specialty=doctor.especialidad,
+                               experience=doctor.exp, img_url=doctor.img)
+    elif tipo == ESPECIALIDAD:
+        for esp in catalog.especialidades():
+            if esp.nombre == referencia:
+                total = len(catalog.doctores(esp.nombre))
+                html = ESPECIALIDAD_CARD.render(icon=esp.icon, nombre=f"{esp.nombre} · {total} profesionales")
+    elif tipo == SERVICIO:
+        for servicio in catalog.servicios():
+            if servicio.id == referencia:
+                html = service_card(servicio)
+    elif tipo == ARTICULO:
+        articulo = catalog.articulo(referencia)
+        if articulo is not None:
+            html = article_card(articulo)
+    if html is None:
+        # Élément disparu du catalogue depuis la sélection
+        _close_selection()
+        return
+    st.markdown(html, unsafe_allow_html=True)
+    st.button("Cerrar", key="busqueda_cerrar", on_click=_close_selection)
+
+# Chaque frappe validée ne réexécute que la barre et ses suggestions
+@measured_fragment("Búsqueda")
+def search_bar():
+    consulta = st.text_input(
+        "Buscar", key="busqueda_q", label_visibility="collapsed",
+        placeholder="🔍 Buscar médicos, especialidades, servicios o artículos"
+    )
+    if consulta.strip():
+        from autocomplete import site_index
+
+        sugerencias = site_index(catalog).suggest(consulta, k=SUGERENCIAS)
+        if not sugerencias:
+            st.caption("Sin resultados.")
+        for i, (tipo, etiqueta, detalle, referencia) in enumerate(sugerencias):
+            texto = f"{etiqueta} · {tipo}" + (f" · {detalle}" if detalle else "")
+            st.button(texto, key=f"busqueda_sug_{i}", use_container_width=True,
+                      on_click=_choose_suggestion, args=(tipo, referencia))
+
+    seleccion = st.session_state.get("busqueda_sel")
+    if seleccion:
+        _show_selection(*seleccion)
@@ -0,0 +1,106 @@
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+
+from write_behind import WriteBehind
+
+# =============================================
+# CONFIGURATION
+# =============================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get("MEDIPEDIDO_DATA_DIR", os.path.join(BASE_DIR, "data"))
+DB_PATH = os.path.join(DATA_DIR, "contactos.db")
+
+# Messages en attente au-delà desquels les nouveaux envois sont refusés
+QUEUE_SIZE = 1000
+# Regroupement des écritures : une transaction par lot
+BATCH_SIZE = 200
+COMMIT_INTERVAL = 0.5
+# Attente maximale du thread Streamlit quand la file est pleine
+SUBMIT_TIMEOUT = 0.05
+
+FIELDS = ("nombre", "email", "telefono", "asunto", "mensaje")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mensajes (
+    id INTEGER PRIMARY KEY,
+    creado TEXT NOT NULL,
+    nombre TEXT NOT NULL,
+    email TEXT NOT NULL,
+    telefono TEXT,
+    asunto TEXT NOT NULL,
+    mensaje TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mensajes_creado ON mensajes (creado);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# =============================================
+# ECRITURE DIFFEREE
+# =============================================
+
+class ContactWriter(WriteBehind):
+    def __init__(self, path=DB_PATH, queue_size=QUEUE_SIZE):
+        super().__init__("contact-writer", queue_size, BATCH_SIZE, COMMIT_INTERVAL)
+        self.path = path
+        self.accepted = 0
+        self.rejected = 0
+        self.written = 0
+        self.failed = 0
+        self.commits = 0
+        self.start()
+
+    def submit(self, mensaje):
+        # Ne bloque jamais plus de SUBMIT_TIMEOUT : la file pleine fait contre-pression
+        record = (datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),) + \
+            tuple(mensaje.get(field, "") for field in FIELDS)
+        if not self.offer(record, SUBMIT_TIMEOUT):
+            self.rejected += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def _connect(self):
+        return connect(self.path)
+
+    def _write(self, conn, batch):
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO mensajes (creado, nombre, email, telefono, asunto, mensaje) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    batch
+                )
+        except sqlite3.Error:
+            self.failed += len(batch)
+            logger.exception("No se pudieron guardar %d mensajes de contacto", len(batch))
+        else:
+            self.written += len(batch)
+            self.commits += 1
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    # Un seul thread d'écriture par processus
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ContactWriter()
+    return _writer
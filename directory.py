@@ -0,0 +1,68 @@
+from bisect import bisect_left, bisect_right
+
+from search_index import fold
+
+# =============================================
+# ANNUAIRE DES PROFESSIONNELS
+# =============================================
+
+class Directory:
+    def __init__(self, doctores):
+        self.doctores = doctores
+        n = len(doctores)
+
+        # Ordre d'affichage : expérience décroissante, puis nom
+        order = sorted(range(n), key=lambda i: (-int(doctores[i].exp), doctores[i].nombre))
+        self._all = (tuple(order), [-int(doctores[i].exp) for i in order])
+
+        # Index par spécialité, déjà triés : un filtre = une recherche dans un dict
+        by_specialty = {}
+        for i in order:
+            by_specialty.setdefault(doctores[i].especialidad, []).append(i)
+        self._by_specialty = {
+            esp: (tuple(ids), [-int(doctores[i].exp) for i in ids])
+            for esp, ids in by_specialty.items()
+        }
+
+        by_university = {}
+        for i in order:
+            by_university.setdefault(doctores[i].universidad, set()).add(i)
+        self._by_university = {uni: frozenset(ids) for uni, ids in by_university.items()}
+
+        self._names = [fold(d.nombre) for d in doctores]
+        self.specialties = {esp: len(ids) for esp, (ids, _) in self._by_specialty.items()}
+        self.universities = sorted(u for u in self._by_university if u)
+        experiences = self._all[1]
+        self.exp_range = (-experiences[-1], -experiences[0]) if experiences else (0, 0)
+
+    def query(self, especialidad=None, universidad=None, exp_min=None, exp_max=None, texto=""):
+        if especialidad is None:
+            ids, keys = self._all
+        else:
+            ids, keys = self._by_specialty.get(especialidad, ((), []))
+
+        # Les clés (-exp) sont croissantes : l'intervalle d'expérience est une tranche
+        start = 0 if exp_max is None else bisect_left(keys, -exp_max)
+        end = len(keys) if exp_min is None else bisect_right(keys, -exp_min)
+        result = ids[start:end]
+
+        if universidad is not None:
+            result = filter(self._by_university.get(universidad, frozenset()).__contains__, result)
+        needle = fold(texto.strip()) if texto else ""
+        if needle:
+            names = self._names
+            result = filter(lambda i: needle in names[i], result)
+        return result
+
+
+_DIRECTORIES = {}
+
+
+def directory(version, doctores):
+    # Un seul annuaire par version du catalogue, partagé par toutes les sessions
+    index = _DIRECTORIES.get(version)
+    if index is None:
+        index = Directory(doctores)
+        _DIRECTORIES.clear()
+        _DIRECTORIES[version] = index
+    return index
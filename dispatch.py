@@ -0,0 +1,171 @@
+import math
+import threading
+
+import numpy as np
+
+# =============================================
+# CONFIGURATION DU DISPATCH
+# =============================================
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Taille d'une case de la grille (~2 km à Buenos Aires)
+CELL_DEGREES = 0.02
+
+# Zone de Buenos Aires (AMBA) pour les flottes synthétiques
+BUENOS_AIRES = {"lat": (-34.75, -34.50), "lon": (-58.55, -58.33)}
+
+# =============================================
+# DISTANCES
+# =============================================
+
+def haversine_km(lat, lon, lats, lons):
+    # Distance d'un point vers un tableau de points, entièrement vectorisée
+    lat1 = np.radians(lat)
+    lats2 = np.radians(lats)
+    dlat = lats2 - lat1
+    dlon = np.radians(np.asarray(lons) - lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lats2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _cell(lat, lon):
+    return (math.floor(lat / CELL_DEGREES), math.floor(lon / CELL_DEGREES))
+
+# =============================================
+# INDEX SPATIAL
+# =============================================
+
+class DispatchIndex:
+    def __init__(self, doctor_ids, lats, lons, specialties):
+        self._lock = threading.Lock()
+        self.ids = np.asarray(doctor_ids)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.available = np.ones(len(self.ids), dtype=bool)
+        self.specialties, self._specialty_codes = np.unique(np.asarray(specialties, dtype=object), return_inverse=True)
+        self._codes = {name: code for code, name in enumerate(self.specialties)}
+        self._positions = {doctor_id: i for i, doctor_id in enumerate(self.ids.tolist())}
+
+        self._cells = {}
+        for i, (lat, lon) in enumerate(zip(self.lats.tolist(), self.lons.tolist())):
+            self._cells.setdefault(_cell(lat, lon), []).append(i)
+        self._refresh_bounds()
+
+    def _refresh_bounds(self):
+        if self._cells:
+            rows = [row for row, _ in self._cells]
+            cols = [col for _, col in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = (0, -1, 0, -1)
+
+    # -- Mises à jour de la flotte ----------------
+
+    def set_available(self, doctor_id, available):
+        self.available[self._positions[doctor_id]] = available
+
+    def move(self, doctor_id, lat, lon):
+        i = self._positions[doctor_id]
+        with self._lock:
+            old, new = _cell(self.lats[i], self.lons[i]), _cell(lat, lon)
+            if old != new:
+                members = self._cells[old]
+                members.remove(i)
+                if not members:
+                    del self._cells[old]
+                self._cells.setdefault(new, []).append(i)
+                self._refresh_bounds()
+            self.lats[i] = lat
+            self.lons[i] = lon
+
+    # -- Recherche des plus proches ---------------
+
+    def _ring(self, center, radius):
+        row, col = center
+        if radius == 0:
+            return self._cells.get(center, ())
+        members = []
+        for r in range(row - radius, row + radius + 1):
+            if r in (row - radius, row + radius):
+                cols = range(col - radius, col + radius + 1)
+            else:
+                cols = (col - radius, col + radius)
+            for c in cols:
+                members.extend(self._cells.get((r, c), ()))
+        return members
+
+    def nearest(self, lat, lon, k=3, specialty=None, accept=None):
+        if specialty is not None and specialty not in self._codes:
+            return []
+        center = _cell(lat, lon)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_radius = max(abs(center[0] - min_row), abs(center[0] - max_row),
+                         abs(center[1] - min_col), abs(center[1] - max_col))
+        # Distance minimale garantie hors de l'anneau r (côté le plus court d'une case)
+        cell_km = CELL_DEGREES * KM_PER_DEGREE * min(1.0, math.cos(math.radians(lat)))
+
+        found_positions = []
+        found_distances = []
+        radius = 0
+        with self._lock:
+            while radius <= max_radius:
+                ring = np.fromiter(self._ring(center, radius), dtype=np.intp)
+                if ring.size:
+                    mask = self.available[ring]
+                    if specialty is not None:
+                        mask &= self._specialty_codes[ring] == self._codes[specialty]
+                    ring = ring[mask]
+                if ring.size and accept is not None:
+                    ring = ring[[accept(doctor_id) for doctor_id in self.ids[ring].tolist()]]
+                if ring.size:
+                    distances = haversine_km(lat, lon, self.lats[ring], self.lons[ring])
+                    found_positions.append(ring)
+                    found_distances.append(distances)
+                    count = sum(len(d) for d in found_distances)
+                    if count >= k:
+                        kth = np.partition(np.concatenate(found_distances), k - 1)[k - 1]
+                        if kth <= radius * cell_km:
+                            break
+                radius += 1
+
+        if not found_positions:
+            return []
+        positions = np.concatenate(found_positions)
+        distances = np.concatenate(found_distances)
+        order = np.argsort(distances, kind="stable")[:k]
+        return [(self.ids[positions[i]].item(), float(distances[i])) for i in order]
+
+
+def synthetic_fleet(n, seed=0, specialties=("Medicina General", "Pediatría", "Cardiología")):
+    # Flotte aléatoire reproductible, pour les essais hors ligne
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(*BUENOS_AIRES["lat"], size=n)
+    lons = rng.uniform(*BUENOS_AIRES["lon"], size=n)
+    codes = rng.integers(0, len(specialties), size=n)
+    return DispatchIndex(np.arange(n), lats, lons, [specialties[c] for c in codes])
+
+
+def _has_position(doctor):
+    lat, lon = doctor.lat, doctor.lon
+    return lat is not None and lon is not None and not (math.isnan(lat) or math.isnan(lon))
+
+
+_INDEXES = {}
+
+
+def dispatch_index(version, doctores):
+    # Un seul index par version du catalogue ; les médecins sans position sont ignorés
+    index = _INDEXES.get(version)
+    if index is None:
+        located = [d for d in doctores if _has_position(d)]
+        index = DispatchIndex(
+            [d.id for d in located],
+            [d.lat for d in located],
+            [d.lon for d in located],
+            [d.especialidad for d in located]
+        )
+        _INDEXES.clear()
+        _INDEXES[version] = index
+    return index
@@ -0,0 +1,160 @@
+import base64
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# =============================================
+# CONFIGURATION DES MINIATURES
+# =============================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Images sources déposées par l'équipe de contenu
+IMAGES_DIR = os.path.realpath(os.path.join(BASE_DIR, "assets", "img"))
+
+# Dossier servi par Streamlit sous /app/static (server.enableStaticServing,
+# .streamlit/config.toml)
+THUMBS_DIR = os.path.join(BASE_DIR, "static", "thumbs")
+THUMBS_URL = "app/static/thumbs"
+
+# Taille d'affichage (px CSS) de chaque emplacement
+SLOTS = {
+    "doctor": (160, 160),
+    "articulo": (360, 200),
+    "articulo_detalle": (760, 380),
+}
+
+# Densité de pixels visée (écrans HiDPI)
+DENSITY = 2
+
+# "static" : fichier servi et mis en cache par le navigateur
+# "inline" : data URI embarquée dans le HTML (aussi le repli quand le
+# service statique est désactivé)
+DELIVERY = os.environ.get("MEDIPEDIDO_IMAGES", "static")
+
+# Hôtes qui redimensionnent à la demande (paramètres imgix d'Unsplash)
+RESIZING_HOSTS = frozenset({"images.unsplash.com"})
+
+_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+_MIME = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+
+logger = logging.getLogger(__name__)
+
+# =============================================
+# GENERATION ET CACHE DISQUE
+# =============================================
+
+@lru_cache(maxsize=1)
+def image_format():
+    # Pillow n'est importé qu'à la première miniature locale
+    from PIL import features
+    return "WEBP" if features.check("webp") else "JPEG"
+
+
+def _pixel_size(slot):
+    width, height = SLOTS[slot]
+    return width * DENSITY, height * DENSITY
+
+
+def _source_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:20]
+
+
+def _render_thumbnail(source_path, target_path, slot):
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as img:
+        img = ImageOps.exif_transpose(img)
+        img = ImageOps.fit(img, _pixel_size(slot), method=Image.Resampling.LANCZOS)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        # Écriture atomique : une autre session peut lire le même fichier
+        tmp_path = f"{target_path}.{os.getpid()}.tmp"
+        if image_format() == "WEBP":
+            img.save(tmp_path, "WEBP", quality=80, method=6)
+        else:
+            img.save(tmp_path, "JPEG", quality=82, optimize=True, progressive=True)
+    os.replace(tmp_path, target_path)
+
+
+@lru_cache(maxsize=2048)
+def _thumbnail(source_path, mtime_ns, slot):
+    # La clé disque est le hash du contenu : un fichier renommé n'est pas régénéré
+    name = f"{_source_digest(source_path)}-{slot}.{_EXTENSIONS[image_format()]}"
+    target_path = os.path.join(THUMBS_DIR, name)
+    if not os.path.exists(target_path):
+        os.makedirs(THUMBS_DIR, exist_ok=True)
+        try:
+            _render_thumbnail(source_path, target_path, slot)
+        except OSError:
+            # Fichier illisible ou pas une image (UnidentifiedImageError est
+            # un OSError) : pas d'image, et l'échec reste en cache pour cette
+            # version du fichier
+            logger.warning("Cannot build thumbnail for %s", source_path, exc_info=True)
+            return None
+    return target_path
+
+
+def thumbnail(source_path, slot):
+    return _thumbnail(source_path, os.stat(source_path).st_mtime_ns, slot)
+
+
+@lru_cache(maxsize=512)
+def _data_uri(thumb_path):
+    with open(thumb_path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode("ascii")
+    return f"data:{_MIME[image_format()]};base64,{encoded}"
+
+# =============================================
+# URL D'AFFICHAGE
+# =============================================
+
+@lru_cache(maxsize=2048)
+def _remote_src(url, slot):
+    # Images Unsplash : on demande directement la taille exacte. Toute autre
+    # URL (autre hôte, URL signée) est laissée intacte
+    parts = urlsplit(url)
+    if parts.hostname not in RESIZING_HOSTS:
+        return url
+    width, height = _pixel_size(slot)
+    query = dict(parse_qsl(parts.query))
+    query.update({"w": str(width), "h": str(height), "fit": "crop", "auto": "format", "q": "75"})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def static_serving():
+    # Lu à chaque appel : l'option vient de .streamlit/config.toml ou de la ligne de commande
+    from streamlit import config
+    return bool(config.get_option("server.enableStaticServing"))
+
+
+def _local_path(source):
+    # Le chemin vient du catalogue : il ne doit jamais sortir de IMAGES_DIR
+    path = os.path.realpath(os.path.join(IMAGES_DIR, source))
+    if os.path.commonpath((path, IMAGES_DIR)) != IMAGES_DIR or not os.path.isfile(path):
+        return None
+    return path
+
+
+def image_src(source, slot):
+    if not source:
+        return ""
+    if source.startswith(("http://", "https://")):
+        return _remote_src(source, slot)
+
+    source_path = _local_path(source)
+    if source_path is None:
+        return ""
+
+    thumb_path = thumbnail(source_path, slot)
+    if thumb_path is None:
+        return ""
+    if DELIVERY == "inline" or not static_serving():
+        return _data_uri(thumb_path)
+    return f"{THUMBS_URL}/{os.path.basename(thumb_path)}"
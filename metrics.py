@@ -0,0 +1,241 @@
+import atexit
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import templates
+from admission import get_admission
+
+# =============================================
+# CONFIGURATION DES MESURES
+# =============================================
+
+# Affiche les mesures dans la barre latérale
+DEBUG = os.environ.get("MEDIPEDIDO_DEBUG") == "1"
+
+# Export périodique : .prom (format texte Prometheus) ou .csv
+EXPORT_PATH = os.environ.get("MEDIPEDIDO_METRICS_FILE")
+EXPORT_INTERVAL = 15.0
+
+# Bornes (secondes) de l'histogramme des temps de rendu
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Nombre de sessions suivies individuellement
+MAX_SESSIONS = 1000
+
+_lock = threading.Lock()
+_pages = {}
+_builders = {}
+_sessions = OrderedDict()
+_last_export = 0.0
+
+
+class PageStats:
+    __slots__ = ("reruns", "seconds", "max_seconds", "buckets", "markdown_calls",
+                 "html_bytes", "bytes", "messages", "last_bytes")
+
+    def __init__(self):
+        self.reruns = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.markdown_calls = 0
+        self.html_bytes = 0
+        self.bytes = 0
+        self.messages = 0
+        self.last_bytes = 0
+
+# =============================================
+# COLLECTE
+# =============================================
+
+def _record(measure):
+    with _lock:
+        stats = _pages.setdefault(measure["page"], PageStats())
+        stats.reruns += 1
+        stats.seconds += measure["seconds"]
+        stats.max_seconds = max(stats.max_seconds, measure["seconds"])
+        for i, bound in enumerate(BUCKETS):
+            if measure["seconds"] <= bound:
+                stats.buckets[i] += 1
+        stats.markdown_calls += measure["markdown_calls"]
+        stats.html_bytes += measure["html_bytes"]
+        stats.bytes += measure["bytes"]
+        stats.messages += measure["messages"]
+        stats.last_bytes = measure["bytes"]
+
+
+def _count_session(session_id):
+    with _lock:
+        reruns = _sessions.pop(session_id, 0) + 1
+        _sessions[session_id] = reruns
+        if len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+        return reruns
+
+
+def count_builder(name):
+    # Appelé par les constructeurs de cartes (componentes)
+    with _lock:
+        _builders[name] = _builders.get(name, 0) + 1
+
+
+@contextmanager
+def measure_rerun():
+    # Temps de rendu, éléments markdown et octets des ForwardMsg envoyés au websocket
+    measure = {"page": None, "seconds": 0.0, "markdown_calls": 0, "html_bytes": 0,
+               "bytes": 0, "messages": 0, "session_reruns": 0}
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        yield measure
+        return
+
+    measure["session_reruns"] = _count_session(ctx.session_id)
+    enqueue = ctx._enqueue
+
+    def counting_enqueue(msg):
+        measure["bytes"] += msg.ByteSize()
+        measure["messages"] += 1
+        if msg.WhichOneof("type") == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            element = msg.delta.new_element
+            if element.WhichOneof("type") == "markdown":
+                measure["markdown_calls"] += 1
+                measure["html_bytes"] += len(element.markdown.body.encode("utf-8"))
+        enqueue(msg)
+
+    ctx._enqueue = counting_enqueue
+    start = time.perf_counter()
+    try:
+        yield measure
+    finally:
+        measure["seconds"] = time.perf_counter() - start
+        ctx._enqueue = enqueue
+        if measure["page"] is not None:
+            _record(measure)
+            _maybe_export()
+
+def measured_fragment(name):
+    # st.fragment dont les reruns partiels sont mesurés à part, sous « name »
+    # (ex. "Blog/artículos") : comparables ligne à ligne à la page entière.
+    # Dans un rerun complet, le fragment est compté avec la page.
+    def decorate(function):
+        @functools.wraps(function)
+        def run(*args, **kwargs):
+            ctx = get_script_run_ctx()
+            if ctx is None or not ctx.fragment_ids_this_run:
+                return function(*args, **kwargs)
+            with measure_rerun() as measure:
+                measure["page"] = name
+                return function(*args, **kwargs)
+        return st.fragment(run)
+    return decorate
+
+# =============================================
+# RAPPORTS ET EXPORT
+# =============================================
+
+def payload_report():
+    with _lock:
+        return [
+            {
+                "pagina": page,
+                "reruns": stats.reruns,
+                "ms_promedio": round(stats.seconds / stats.reruns * 1000, 1),
+                "ms_max": round(stats.max_seconds * 1000, 1),
+                "markdown_por_rerun": stats.markdown_calls // stats.reruns,
+                "html_bytes_por_rerun": stats.html_bytes // stats.reruns,
+                "bytes_por_rerun": stats.bytes // stats.reruns,
+                "mensajes_por_rerun": stats.messages // stats.reruns,
+                "ultimo_rerun": stats.last_bytes,
+            }
+            for page, stats in sorted(_pages.items())
+        ]
+
+
+def prometheus_text():
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    with _lock:
+        pages = sorted(_pages.items())
+        lines.append("# HELP medipedido_render_seconds Tiempo de render por página")
+        lines.append("# TYPE medipedido_render_seconds histogram")
+        for page, stats in pages:
+            for bound, count in zip(BUCKETS, stats.buckets):
+                lines.append(f'medipedido_render_seconds_bucket{{pagina="{page}",le="{bound}"}} {count}')
+            lines.append(f'medipedido_render_seconds_bucket{{pagina="{page}",le="+Inf"}} {stats.reruns}')
+            lines.append(f'medipedido_render_seconds_sum{{pagina="{page}"}} {round(stats.seconds, 6)}')
+            lines.append(f'medipedido_render_seconds_count{{pagina="{page}"}} {stats.reruns}')
+        metric("medipedido_markdown_calls_total", "counter", "Elementos st.markdown emitidos",
+               [({"pagina": p}, s.markdown_calls) for p, s in pages])
+        metric("medipedido_html_bytes_total", "counter", "Bytes de HTML/markdown emitidos",
+               [({"pagina": p}, s.html_bytes) for p, s in pages])
+        metric("medipedido_payload_bytes_total", "counter", "Bytes de ForwardMsg enviados",
+               [({"pagina": p}, s.bytes) for p, s in pages])
+        metric("medipedido_card_builds_total", "counter", "Llamadas a constructores de tarjetas",
+               [({"builder": b}, n) for b, n in sorted(_builders.items())])
+        metric("medipedido_sessions", "gauge", "Sesiones con al menos un rerun (recientes)",
+               [({}, len(_sessions))])
+        metric("medipedido_session_reruns_total", "counter", "Reruns de las sesiones recientes",
+               [({}, sum(_sessions.values()))])
+
+    admission = get_admission().snapshot()
+    metric("medipedido_contact_admission_total", "counter", "Envíos del formulario de contacto por decisión",
+           [({"decision": d}, admission[d]) for d in ("admitido", "limite_sesion", "limite_ip", "duplicado")])
+    metric("medipedido_contact_admission_keys", "gauge", "Claves seguidas por el limitador",
+           [({"tipo": t}, admission[t]) for t in ("sesiones", "ips", "huellas")])
+
+    cache = templates.cache_info()
+    metric("medipedido_template_cache_hits_total", "counter", "Fragmentos servidos desde la caché",
+           [({}, cache.hits)])
+    metric("medipedido_template_cache_misses_total", "counter", "Fragmentos renderizados",
+           [({}, cache.misses)])
+    return "\n".join(lines) + "\n"
+
+
+def csv_text():
+    rows = payload_report()
+    if not rows:
+        return ""
+    header = list(rows[0])
+    lines = [",".join(header)]
+    lines.extend(",".join(str(row[column]) for column in header) for row in rows)
+    return "\n".join(lines) + "\n"
+
+
+def export_metrics(path=EXPORT_PATH):
+    content = csv_text() if path.endswith(".csv") else prometheus_text()
+    # Écriture atomique : le collecteur ne lit jamais un fichier à moitié écrit
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _maybe_export():
+    global _last_export
+    if not EXPORT_PATH:
+        return
+    now = time.monotonic()
+    with _lock:
+        if now - _last_export < EXPORT_INTERVAL:
+            return
+        _last_export = now
+    export_metrics()
+
+
+if EXPORT_PATH:
+    # Dernier export à l'arrêt du processus
+    atexit.register(export_metrics)
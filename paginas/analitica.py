@@ -0,0 +1,84 @@
+import datetime
+
+import plotly.express as px
+import streamlit as st
+
+from componentes import PAGE_HEADER
+from rollups import MAX_PUNTOS, downsample, last_update, load_series
+
+# Ventana -> (granularidad del rollup, duración)
+VENTANAS = {
+    "Últimas 48 horas": ("hora", datetime.timedelta(hours=48)),
+    "Últimos 30 días": ("hora", datetime.timedelta(days=30)),
+    "Último año": ("dia", datetime.timedelta(days=365)),
+    "Todo el historial": ("dia", None),
+}
+
+# =============================================
+# ANALYTIQUE INTERNE
+# =============================================
+
+def _series(serie, granularidad, duracion):
+    desde = None
+    if duracion is not None:
+        desde = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - duracion
+    return downsample(load_series(serie, granularidad, desde), granularidad, MAX_PUNTOS)
+
+def _tiempos_de_respuesta(frame):
+    # Media ponderada por número de despachos, todas las especialidades juntas
+    total = frame.groupby("periodo", as_index=False).agg(
+        n=("n", "sum"), suma=("suma", "sum"), maximo=("maximo", "max"))
+    total["Media"] = total["suma"] / total["n"]
+    total = total.rename(columns={"maximo": "Máximo"})
+    return total.melt(id_vars="periodo", value_vars=["Media", "Máximo"], var_name="medida", value_name="minutos")
+
+def analitica_page():
+    st.markdown(PAGE_HEADER.render(
+        variant="",
+        titulo="Analítica de operaciones",
+        subtitulo="Uso interno · datos agregados por hora y por día"
+    ), unsafe_allow_html=True)
+
+    marcas = last_update()
+    if not marcas:
+        st.info("Aún no hay agregados. Ejecuta `python rollups.py` (o `--loop`) para generarlos.")
+        return
+    st.caption(" · ".join(f"{fuente}: actualizado {fecha}" for fuente, fecha in sorted(marcas.items())))
+
+    ventana = st.selectbox("Periodo", list(VENTANAS), index=1, key="analitica_ventana")
+    granularidad, duracion = VENTANAS[ventana]
+
+    # Visitas por especialidad
+    visitas = _series("visitas", granularidad, duracion)
+    st.subheader("Visitas por especialidad")
+    if visitas.empty:
+        st.caption("Sin visitas en este periodo.")
+    else:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            totales = visitas.groupby("clave", as_index=False)["n"].sum().sort_values("n")
+            st.plotly_chart(px.bar(totales, x="n", y="clave", orientation="h",
+                                   labels={"n": "Visitas", "clave": ""}), use_container_width=True)
+        with col2:
+            st.plotly_chart(px.area(visitas, x="periodo", y="n", color="clave",
+                                    labels={"n": "Visitas", "periodo": "", "clave": "Especialidad"}),
+                            use_container_width=True)
+
+    # Tiempos de respuesta
+    respuesta = _series("respuesta", granularidad, duracion)
+    st.subheader("Tiempo de respuesta (minutos hasta la llegada)")
+    if respuesta.empty:
+        st.caption("Sin despachos en este periodo.")
+    else:
+        st.plotly_chart(px.line(_tiempos_de_respuesta(respuesta), x="periodo", y="minutos", color="medida",
+                                labels={"periodo": "", "medida": ""}), use_container_width=True)
+
+    # Volumen de contactos
+    contactos = _series("contactos", granularidad, duracion)
+    st.subheader("Mensajes de contacto")
+    if contactos.empty:
+        st.caption("Sin mensajes en este periodo.")
+    else:
+        st.plotly_chart(px.bar(contactos, x="periodo", y="n", color="clave",
+                               labels={"n": "Mensajes", "periodo": "", "clave": "Asunto"}),
+                        use_container_width=True)
@@ -0,0 +1,82 @@
+from html import escape
+
+import streamlit as st
+
+from article_bodies import article_html
+from componentes import PAGE_HEADER, article_card, article_detail, catalog, pagination_controls
+from metrics import measured_fragment
+from templates import Markup
+from pagination import current_page, paginate
+from search_index import article_index
+
+ARTICULOS_POR_PAGINA = 10
+
+# =============================================
+# BLOG
+# =============================================
+
+def _open_article(articulo_id):
+    st.session_state["blog_articulo"] = articulo_id
+
+def _close_article():
+    st.session_state.pop("blog_articulo", None)
+
+def article_view(articulo):
+    st.button("← Volver al blog", key="blog_volver", on_click=_close_article)
+    # Único punto donde se lee el cuerpo del artículo
+    contenido = article_html(articulo.slug)
+    if contenido is None:
+        contenido = (f"<p>{escape(articulo.resumen or '')}</p>"
+                     "<p class='muted'>El artículo completo estará disponible pronto.</p>")
+    st.markdown(article_detail(articulo, Markup(contenido)), unsafe_allow_html=True)
+
+# Recherche, résultats et pagination : seul ce bloc est réexécuté (et
+# renvoyé) quand le lecteur filtre ou change de page
+@measured_fragment("Blog/artículos")
+def blog_articles():
+    # Artículos del blog
+    version, articulos = catalog.snapshot("articulos")
+    index = article_index(version, articulos)
+    
+    # Barra de búsqueda
+    with st.expander("🔍 Buscar artículos", expanded=False):
+        col1, col2 = st.columns([3,1])
+        with col1:
+            search_query = st.text_input("Buscar por palabras clave", key="blog_search")
+        with col2:
+            # Categorías presentes en el catálogo
+            category = st.selectbox("Categoría", ["Todas"] + sorted(index.categories), key="blog_category")
+    
+    # Filtrado
+    resultados = index.search(search_query, None if category == "Todas" else category)
+    
+    # Solo se materializa la página visible
+    pagina = current_page(st.session_state, "blog_pagina", (search_query, category))
+    visibles, hay_mas = paginate(resultados, pagina, ARTICULOS_POR_PAGINA)
+    
+    for i, doc_id in enumerate(visibles):
+        articulo = articulos[doc_id]
+        st.markdown(article_card(articulo, delay=i*150), unsafe_allow_html=True)
+        if st.button("Leer artículo", key=f"leer_{articulo.id}"):
+            # La vista de detalle reemplaza la página entera
+            _open_article(articulo.id)
+            st.rerun()
+    
+    pagination_controls("blog_pagina", pagina, hay_mas)
+
+def blog_page():
+    articulo_id = st.session_state.get("blog_articulo")
+    if articulo_id is not None:
+        articulo = catalog.articulo(articulo_id)
+        if articulo is not None:
+            article_view(articulo)
+            return
+        _close_article()
+
+    st.markdown(PAGE_HEADER.render(
+        variant="",
+        titulo="Blog de Salud MediPedido",
+        subtitulo="Consejos médicos y novedades para tu bienestar"
+    ), unsafe_allow_html=True)
+    
+    blog_articles()
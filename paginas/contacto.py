@@ -0,0 +1,111 @@
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from admission import ADMITIDO, DUPLICADO, TRUSTED_PROXIES, get_admission
+from componentes import PAGE_HEADER
+from contact_store import get_writer
+from metrics import measured_fragment
+
+# =============================================
+# CONTACT
+# =============================================
+
+def _client_ip():
+    context = getattr(st, "context", None)
+    if context is None:
+        return None
+    if TRUSTED_PROXIES:
+        # La dirección añadida por el proxy de confianza más lejano, no la primera
+        forwarded = [ip.strip() for ip in context.headers.get("X-Forwarded-For", "").split(",") if ip.strip()]
+        if len(forwarded) >= TRUSTED_PROXIES:
+            return forwarded[-TRUSTED_PROXIES]
+    return getattr(context, "ip_address", None)
+
+# Seul le formulaire est réexécuté à l'envoi : ni le design, ni la
+# navigation, ni la carte d'informations ne sont renvoyés
+@measured_fragment("Contacto/formulario")
+def contact_form():
+    with st.form(key="contact_form"):
+        st.markdown("""
+        <div class="card contact-card">
+            <h2>Envíanos un mensaje</h2>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            nombre = st.text_input("Nombre completo*", key="contact_name")
+        with col2:
+            email = st.text_input("Email*", key="contact_email")
+        
+        telefono = st.text_input("Teléfono", key="contact_phone")
+        asunto = st.selectbox("Asunto*", 
+                            ["Consulta general", "Soporte técnico", "Trabaja con nosotros", "Prensa", "Otro"],
+                            key="contact_subject")
+        mensaje = st.text_area("Mensaje*", height=150, key="contact_message")
+        
+        st.markdown("<small>* Campos obligatorios</small>", unsafe_allow_html=True)
+        
+        if st.form_submit_button("Enviar mensaje", type="primary"):
+            datos = {
+                "nombre": nombre.strip(),
+                "email": email.strip(),
+                "telefono": telefono.strip(),
+                "asunto": asunto,
+                "mensaje": mensaje.strip()
+            }
+            motivo = None
+            if datos["nombre"] and datos["email"] and datos["mensaje"]:
+                # Rechazo temprano, en memoria, antes de cualquier escritura
+                ctx = get_script_run_ctx()
+                motivo = get_admission().admit(ctx.session_id if ctx else None, _client_ip(), datos)
+            if motivo is None:
+                st.error("Completa los campos obligatorios.")
+            elif motivo == DUPLICADO:
+                st.info("Ya recibimos este mensaje. Te responderemos en breve.")
+            elif motivo != ADMITIDO:
+                st.warning("Has enviado varios mensajes seguidos. Intenta de nuevo en un minuto.")
+            elif get_writer().submit(datos):
+                st.success("¡Gracias por tu mensaje! Te responderemos en breve.")
+                st.balloons()
+            else:
+                # No guardado: el reenvío no debe contar como duplicado
+                get_admission().withdraw(datos)
+                st.warning("Estamos recibiendo muchos mensajes. Intenta de nuevo en unos segundos.")
+        
+        st.markdown("</div>", unsafe_allow_html=True)
+
+def contacto_page():
+    st.markdown(PAGE_HEADER.render(
+        variant="",
+        titulo="Contacta con MediPedido",
+        subtitulo="Estamos aquí para ayudarte"
+    ), unsafe_allow_html=True)
+    
+    cols = st.columns(2)
+    
+    with cols[0]:
+        st.markdown("""
+        <div class="card contact-card">
+        <h2>Información de Contacto</h2>
+        <div class="contact-item">
+        <div class="contact-icon">📌</div>
+        <div><h4>Dirección</h4><p>Av. Corrientes 1234, Buenos Aires</p></div>
+        </div>
+        <div class="contact-item">
+        <div class="contact-icon">📞</div>
+        <div><h4>Teléfono</h4><p>+54 11 1234-5678</p></div>
+        </div>
+        <div class="contact-item">
+        <div class="contact-icon">✉️</div>
+        <div><h4>Email</h4><p>info@medipedido.com.ar</p></div>
+        </div>
+        <div class="contact-hours">
+        <h4>Horario de Atención</h4>
+        <p><strong>Servicio médico:</strong> 24/7</p>
+        <p><strong>Oficinas administrativas:</strong> Lunes a Viernes de 9:00 a 18:00</p>
+        </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with cols[1]:
+        contact_form()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+
+import streamlit as st
+
+from componentes import PAGE_HEADER
+from roster_import import FALLIDO, TERMINADO, current_import, start_import
+
+# =============================================
+# IMPORT DU PLANTEL (INTERNE)
+# =============================================
+
+def _save_upload(archivo):
+    # Copie sur disque : openpyxl lit le classeur en flux depuis le fichier
+    fd, path = tempfile.mkstemp(prefix="medipedido-import-", suffix=".xlsx")
+    with os.fdopen(fd, "wb") as f:
+        shutil.copyfileobj(archivo, f)
+    return path
+
+def _job_status(job):
+    if job.activo:
+        st.info(f"Importando **{job.nombre}**…")
+        if job.total:
+            st.progress(min(job.fila / job.total, 1.0), text=f"{job.hoja}: fila {job.fila} de {job.total}")
+        elif job.hoja:
+            st.caption(f"{job.hoja}: fila {job.fila}")
+        st.button("Actualizar estado", key="importar_refrescar")
+        return
+    
+    if job.estado == FALLIDO:
+        st.error(f"La importación de {job.nombre} falló: {job.error}")
+        return
+    
+    report = job.report
+    if job.estado == TERMINADO and report["importado"]:
+        st.success(f"{job.nombre}: {report['nuevos']} profesionales nuevos, {report['actualizados']} actualizados, "
+                   f"{report['horarios']} franjas horarias ({report['segundos']} s).")
+    else:
+        st.warning(f"{job.nombre}: no se modificó el catálogo ({report['total_errores']} errores).")
+    
+    for hoja, resumen in report["hojas"].items():
+        st.caption(f"Hoja «{hoja}» ({resumen['tipo']}): {resumen['validas']} de {resumen['filas']} filas válidas")
+    if report["errores"]:
+        st.subheader(f"Errores ({report['total_errores']})")
+        if report["total_errores"] > len(report["errores"]):
+            st.caption(f"Se muestran los primeros {len(report['errores'])}.")
+        st.dataframe(report["errores"], hide_index=True, use_container_width=True)
+
+def importar_page():
+    st.markdown(PAGE_HEADER.render(
+        variant="",
+        titulo="Importar profesionales y horarios",
+        subtitulo="Uso interno · libro Excel con hojas de profesionales y/o horarios"
+    ), unsafe_allow_html=True)
+    
+    st.caption("Profesionales: matricula, nombre, especialidad, exp (universidad, img, lat, lon opcionales). "
+               "Horarios: matricula, dia, desde, hasta. La matrícula identifica al profesional; "
+               "el horario importado reemplaza al anterior.")
+    
+    job = current_import()
+    ocupado = job is not None and job.activo
+    
+    with st.form("importar_form", clear_on_submit=True):
+        archivo = st.file_uploader("Libro Excel (.xlsx)", type=["xlsx"])
+        estricto = st.checkbox("No importar nada si hay errores", key="importar_estricto")
+        enviado = st.form_submit_button("Importar", type="primary", disabled=ocupado)
+    
+    if enviado and archivo is not None:
+        nuevo = start_import(_save_upload(archivo), archivo.name, strict=estricto)
+        if nuevo is None:
+            st.warning("Ya hay una importación en curso.")
+        else:
+            job = nuevo
+    
+    if job is not None:
+        _job_status(job)
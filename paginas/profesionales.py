@@ -0,0 +1,186 @@
+import datetime
+import logging
+import sqlite3
+
+import streamlit as st
+
+from agenda import HORIZON_DAYS, SLOT_MINUTES
+from booking_store import get_bookings
+from componentes import (DURACION_CITA, ESPECIALIDAD_CARD, PAGE_HEADER, SECTION_HEADING, catalog,
+                         current_agenda, doctor_card, pagination_controls)
+from directory import directory
+from metrics import measured_fragment
+from pagination import current_page, paginate
+
+PROFESIONALES_POR_PAGINA = 9
+
+logger = logging.getLogger(__name__)
+
+# =============================================
+# PRISE DE RENDEZ-VOUS
+# =============================================
+
+def _select_specialty(especialidad):
+    st.session_state["prof_especialidad"] = especialidad
+
+def _open_booking(doctor_id):
+    st.session_state["cita_doctor"] = doctor_id
+
+def _sync_bookings(agenda, doctor_id):
+    # Citas tomadas por otro proceso del servidor: se marcan en la agenda local
+    desde = datetime.datetime.combine(agenda.first_day, datetime.time())
+    for _, inicio, minutos in get_bookings().upcoming(desde, doctor_id):
+        agenda.restore(doctor_id, inicio, minutos)
+
+def _slot_taken(agenda, doctor, turno):
+    # Se propone el siguiente turno libre, preseleccionado si es el mismo día
+    siguiente = agenda.next_free(doctor.id, after=turno, length=DURACION_CITA)
+    if siguiente is None:
+        st.error("Ese horario acaba de ser reservado y no quedan turnos libres.")
+        return
+    st.session_state[f"cita_sugerido_{doctor.id}"] = agenda.slot_datetime(siguiente)
+    st.error(f"Ese horario acaba de ser reservado. Próximo turno libre: "
+             f"{agenda.slot_datetime(siguiente):%d/%m %H:%M}.")
+
+def booking_panel(doctor):
+    agenda = current_agenda()
+    ahora = agenda.slot_at(datetime.datetime.now()) + 1
+    proximo = agenda.next_free(doctor.id, after=ahora, length=DURACION_CITA)
+    if proximo is None:
+        st.warning(f"Sin turnos disponibles en los próximos {HORIZON_DAYS} días.")
+        return
+    
+    st.caption(f"Próximo turno libre: {agenda.slot_datetime(proximo):%d/%m %H:%M}")
+    dia = st.date_input(
+        "Día",
+        value=agenda.slot_datetime(proximo).date(),
+        min_value=agenda.first_day,
+        max_value=agenda.first_day + datetime.timedelta(days=HORIZON_DAYS - 1),
+        key=f"cita_dia_{doctor.id}"
+    )
+    # Lista de horarios fijada al mostrarse: si otra sesión reserva el turno
+    # elegido, el selectbox no cambia de opción y reserve() lo rechaza
+    clave = f"cita_turnos_{doctor.id}"
+    guardado = st.session_state.get(clave)
+    if guardado is None or guardado[0] != dia:
+        libres = agenda.free_slots(doctor.id, dia, length=DURACION_CITA, after=ahora)
+        guardado = (dia, [agenda.slot_datetime(slot) for slot in libres])
+        st.session_state[clave] = guardado
+    turnos = guardado[1]
+    if not turnos:
+        st.info("No hay turnos libres ese día.")
+        return
+    
+    with st.form(key=f"cita_form_{doctor.id}"):
+        sugerido = st.session_state.get(f"cita_sugerido_{doctor.id}")
+        inicio = st.selectbox("Horario", turnos, index=turnos.index(sugerido) if sugerido in turnos else 0,
+                              format_func=lambda moment: f"{moment:%H:%M}")
+        paciente = st.text_input("Nombre del paciente")
+        if st.form_submit_button("Confirmar cita", type="primary"):
+            if not paciente.strip():
+                st.error("Indica el nombre del paciente.")
+                return
+            turno = agenda.slot_at(inicio)
+            # La lista se recalcula en la próxima ejecución
+            del st.session_state[clave]
+            if turno < ahora or not agenda.reserve(doctor.id, turno, DURACION_CITA):
+                _slot_taken(agenda, doctor, max(turno, ahora))
+                return
+            try:
+                guardada = get_bookings().add(doctor.id, inicio, DURACION_CITA * SLOT_MINUTES, paciente.strip(),
+                                              SLOT_MINUTES)
+            except sqlite3.Error:
+                agenda.release(doctor.id, turno, DURACION_CITA)
+                logger.exception("No se pudo guardar la cita del médico %s", doctor.id)
+                st.error("No pudimos registrar la cita. Inténtalo de nuevo.")
+                return
+            if not guardada:
+                # Reservado por otro proceso: la base lo rechazó (clave única)
+                agenda.release(doctor.id, turno, DURACION_CITA)
+                _sync_bookings(agenda, doctor.id)
+                _slot_taken(agenda, doctor, turno)
+                return
+            st.session_state.pop(f"cita_sugerido_{doctor.id}", None)
+            st.success(f"Cita confirmada con {doctor.nombre} el {inicio:%d/%m a las %H:%M}.")
+
+# =============================================
+# ANNUAIRE DES PROFESSIONNELS
+# =============================================
+
+# Filtres, cartes, prise de rendez-vous et pagination : réexécutés seuls,
+# sans l'en-tête ni la grille des spécialités
+@measured_fragment("Profesionales/directorio")
+def doctor_directory():
+    version, doctores, especialidades = catalog.snapshot("doctores", "especialidades")
+    directorio = directory(version, doctores)
+    
+    nombres_especialidades = [esp.nombre for esp in especialidades]
+    nombres_especialidades += sorted(set(directorio.specialties) - set(nombres_especialidades))
+    
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        texto = st.text_input("Buscar por nombre", key="prof_buscar")
+    with col2:
+        especialidad = st.selectbox("Especialidad", ["Todas"] + nombres_especialidades, key="prof_especialidad")
+    with col3:
+        universidad = st.selectbox("Universidad", ["Todas"] + directorio.universities, key="prof_universidad")
+    with col4:
+        exp_min, exp_max = directorio.exp_range
+        if exp_min < exp_max:
+            exp_min, exp_max = st.slider("Años de experiencia", exp_min, exp_max, (exp_min, exp_max), key="prof_exp")
+    
+    resultados = directorio.query(
+        especialidad=None if especialidad == "Todas" else especialidad,
+        universidad=None if universidad == "Todas" else universidad,
+        exp_min=exp_min,
+        exp_max=exp_max,
+        texto=texto
+    )
+    pagina = current_page(st.session_state, "prof_pagina", (texto, especialidad, universidad, exp_min, exp_max))
+    visibles, hay_mas = paginate(resultados, pagina, PROFESIONALES_POR_PAGINA)
+    
+    if not visibles:
+        st.info("No encontramos profesionales con esos criterios.")
+    
+    cols = st.columns(3)
+    for i, doc_id in enumerate(visibles):
+        doctor = doctores[doc_id]
+        with cols[i % len(cols)]:
+            st.markdown(doctor_card(
+                name=doctor.nombre,
+                specialty=doctor.especialidad,
+                experience=doctor.exp,
+                img_url=doctor.img,
+                delay=(i % len(cols))*200
+            ), unsafe_allow_html=True)
+            st.button("Pedir cita", key=f"cita_{doctor.id}", use_container_width=True,
+                      on_click=_open_booking, args=(doctor.id,))
+            if st.session_state.get("cita_doctor") == doctor.id:
+                booking_panel(doctor)
+    
+    pagination_controls("prof_pagina", pagina, hay_mas)
+
+def profesionales_page():
+    st.markdown(PAGE_HEADER.render(
+        variant="",
+        titulo="Nuestro Equipo Médico",
+        subtitulo="Profesionales certificados y con amplia experiencia"
+    ), unsafe_allow_html=True)
+    
+    # Directorio de profesionales
+    st.markdown(SECTION_HEADING.render(variant="", titulo="Nuestros Profesionales"), unsafe_allow_html=True)
+    doctor_directory()
+    
+    version, doctores, especialidades = catalog.snapshot("doctores", "especialidades")
+    directorio = directory(version, doctores)
+    
+    # Todas las especialidades
+    st.markdown(SECTION_HEADING.render(variant="spaced", titulo="Todas Nuestras Especialidades"), unsafe_allow_html=True)
+    
+    cols = st.columns(3)
+    for i, esp in enumerate(especialidades):
+        with cols[i%3]:
+            st.markdown(ESPECIALIDAD_CARD.render(icon=esp.icon, nombre=esp.nombre), unsafe_allow_html=True)
+            total = directorio.specialties.get(esp.nombre, 0)
+            st.button(f"Ver {total} profesionales", key=f"prof_esp_{i}", disabled=total == 0,
+                      on_click=_select_specialty, args=(esp.nombre,))
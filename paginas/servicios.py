@@ -0,0 +1,86 @@
+import datetime
+
+import streamlit as st
+
+from componentes import DURACION_CITA, PAGE_HEADER, PASO_CARD, catalog, current_agenda, service_card
+from dispatch import dispatch_index
+from stats_store import get_stats
+
+# Velocidad media de desplazamiento en ciudad
+VELOCIDAD_KMH = 25
+
+BARRIOS = {
+    "Palermo": (-34.5889, -58.4306),
+    "Recoleta": (-34.5875, -58.3974),
+    "Belgrano": (-34.5627, -58.4565),
+    "Caballito": (-34.6186, -58.4420),
+    "San Telmo": (-34.6218, -58.3731),
+    "Villa Urquiza": (-34.5731, -58.4876),
+    "Flores": (-34.6286, -58.4636),
+    "Almagro": (-34.6093, -58.4211)
+}
+
+# =============================================
+# SERVICES
+# =============================================
+
+def servicios_page():
+    st.markdown(PAGE_HEADER.render(
+        variant="",
+        titulo="Nuestros Servicios Médicos",
+        subtitulo="Atención profesional cuando y donde la necesites"
+    ), unsafe_allow_html=True)
+    
+    servicios = catalog.servicios()
+    
+    cols = st.columns(3)
+    for i, servicio in enumerate(servicios):
+        with cols[i % len(cols)]:
+            st.markdown(service_card(servicio, delay=i*200), unsafe_allow_html=True)
+    
+    # Proceso de atención
+    st.markdown("""
+    <div class="section-title"><h2>¿Cómo funciona MediPedido?</h2></div>
+    """, unsafe_allow_html=True)
+    
+    pasos = catalog.pasos()
+    
+    cols = st.columns(4)
+    for i, paso in enumerate(pasos):
+        with cols[i % len(cols)]:
+            st.markdown(PASO_CARD.render(icon=paso.icon, title=paso.title, desc=paso.desc), unsafe_allow_html=True)
+    
+    # Solicitud de médico a domicilio
+    with st.expander("🚑 Solicitar un médico a domicilio", expanded=False):
+        version, doctores = catalog.snapshot("doctores")
+        flota = dispatch_index(version, doctores)
+        col1, col2 = st.columns(2)
+        with col1:
+            barrio = st.selectbox("Barrio", list(BARRIOS), key="dispatch_barrio")
+        with col2:
+            especialidad = st.selectbox("Especialidad", ["Cualquiera"] + list(flota.specialties), key="dispatch_especialidad")
+        
+        if st.button("Buscar médico disponible", key="dispatch_buscar"):
+            agenda = current_agenda()
+            ahora = agenda.slot_at(datetime.datetime.now())
+            lat, lon = BARRIOS[barrio]
+            candidatos = flota.nearest(
+                lat, lon, k=3,
+                specialty=None if especialidad == "Cualquiera" else especialidad,
+                accept=lambda doctor_id: agenda.is_free(doctor_id, ahora, DURACION_CITA)
+            )
+            mostrados = 0
+            for doctor_id, distancia in candidatos:
+                doctor = catalog.doctor(doctor_id)
+                if doctor is None:
+                    # Profesional retirado del catálogo desde que se construyó el índice
+                    continue
+                minutos = max(5, round(distancia / VELOCIDAD_KMH * 60))
+                if mostrados == 0:
+                    # Tiempo de respuesta del primer candidato, para la analítica
+                    get_stats().record_dispatch(doctor_id, minutos)
+                mostrados += 1
+                st.markdown(f"**{doctor.nombre}** · {doctor.especialidad} · "
+                            f"{distancia:.1f} km · llega en ~{minutos} min")
+            if not mostrados:
+                st.warning("No hay profesionales disponibles cerca en este momento.")
@@ -0,0 +1,23 @@
+from itertools import islice
+
+# =============================================
+# PAGINATION PARESSEUSE
+# =============================================
+
+def paginate(items, page, size):
+    # Ne matérialise que la page demandée (+1 élément pour savoir s'il y a une suite)
+    start = page * size
+    if hasattr(items, "__getitem__"):
+        chunk = list(items[start:start + size + 1])
+    else:
+        chunk = list(islice(items, start, start + size + 1))
+    return chunk[:size], len(chunk) > size
+
+
+def current_page(state, key, filters):
+    # Revient à la première page dès que les filtres changent
+    filters_key = f"{key}_filtros"
+    if state.get(filters_key) != filters:
+        state[filters_key] = filters
+        state[key] = 0
+    return state.get(key, 0)
@@ -0,0 +1,226 @@
+import argparse
+import datetime
+import math
+import os
+import sqlite3
+import time
+
+import catalog
+import contact_store
+import stats_store
+
+# =============================================
+# CONFIGURATION
+# =============================================
+
+DB_PATH = os.path.join(stats_store.DATA_DIR, "rollups.db")
+
+# Événements agrégés par transaction : borne la durée des verrous
+CHUNK_ROWS = 1_000_000
+LOOP_INTERVAL = 60.0
+
+# Points maximum par série envoyés à Plotly
+MAX_PUNTOS = 400
+
+GRANULARIDADES = {
+    # tabla, longitud del prefijo ISO, sufijo, paso base
+    "hora": ("rollup_hora", 13, ":00", datetime.timedelta(hours=1)),
+    "dia": ("rollup_dia", 10, "", datetime.timedelta(days=1)),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_hora (
+    serie TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    periodo TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    suma REAL NOT NULL,
+    minimo REAL,
+    maximo REAL,
+    PRIMARY KEY (serie, clave, periodo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_dia (
+    serie TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    periodo TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    suma REAL NOT NULL,
+    minimo REAL,
+    maximo REAL,
+    PRIMARY KEY (serie, clave, periodo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS marcas (
+    fuente TEXT PRIMARY KEY,
+    ultimo_id INTEGER NOT NULL,
+    actualizado TEXT NOT NULL
+);
+"""
+
+# Fuente -> (base adjunta, tabla, consulta del lote)
+# Cada consulta agrega los ids ]?, ?] por (serie, clave, periodo)
+FUENTES = {
+    "eventos": ("ev", "eventos", f"""
+        SELECT 'visitas', COALESCE(m.especialidad, 'Sin especialidad'), substr(e.creado, 1, :largo) || :sufijo,
+               COUNT(*), 0, NULL, NULL
+        FROM ev.eventos e LEFT JOIN temp.medicos m ON m.id = e.doctor_id
+        WHERE e.id > :desde AND e.id <= :hasta AND e.tipo = '{stats_store.VISITA}'
+        GROUP BY 2, 3
+        UNION ALL
+        SELECT 'respuesta', COALESCE(m.especialidad, 'Sin especialidad'), substr(e.creado, 1, :largo) || :sufijo,
+               COUNT(*), SUM(e.valor), MIN(e.valor), MAX(e.valor)
+        FROM ev.eventos e LEFT JOIN temp.medicos m ON m.id = e.doctor_id
+        WHERE e.id > :desde AND e.id <= :hasta AND e.tipo = '{stats_store.DESPACHO}' AND e.valor IS NOT NULL
+        GROUP BY 2, 3
+    """),
+    "mensajes": ("ct", "mensajes", """
+        SELECT 'contactos', asunto, substr(creado, 1, :largo) || :sufijo, COUNT(*), 0, NULL, NULL
+        FROM ct.mensajes
+        WHERE id > :desde AND id <= :hasta
+        GROUP BY 2, 3
+    """),
+}
+
+UPSERT = """
+INSERT INTO {tabla} (serie, clave, periodo, n, suma, minimo, maximo)
+{consulta}
+ON CONFLICT (serie, clave, periodo) DO UPDATE SET
+    n = n + excluded.n,
+    suma = suma + excluded.suma,
+    minimo = min(coalesce(minimo, excluded.minimo), coalesce(excluded.minimo, minimo)),
+    maximo = max(coalesce(maximo, excluded.maximo), coalesce(excluded.maximo, maximo))
+"""
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# =============================================
+# TACHE D'AGREGATION
+# =============================================
+
+def _load_specialties(conn, path=catalog.DB_PATH):
+    # Copie id -> especialidad du catalogue, pour la jointure des visites
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS medicos (id INTEGER PRIMARY KEY, especialidad TEXT)")
+        conn.execute("DELETE FROM temp.medicos")
+        if not os.path.exists(path):
+            return
+        source = sqlite3.connect(path, timeout=30)
+        try:
+            conn.executemany("INSERT INTO temp.medicos VALUES (?, ?)",
+                             source.execute("SELECT id, especialidad FROM doctores"))
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            source.close()
+
+
+def _aggregate_source(conn, fuente, chunk_rows):
+    schema, table, consulta = FUENTES[fuente]
+    row = conn.execute("SELECT ultimo_id FROM marcas WHERE fuente = ?", (fuente,)).fetchone()
+    desde = row[0] if row else 0
+    fin = conn.execute(f"SELECT MAX(id) FROM {schema}.{table}").fetchone()[0] or 0
+    total = 0
+    while desde < fin:
+        hasta = min(desde + chunk_rows, fin)
+        # Un lot = une transaction : rollups et marque avancent ensemble
+        with conn:
+            for tabla, largo, sufijo, _ in GRANULARIDADES.values():
+                conn.execute(UPSERT.format(tabla=tabla, consulta=consulta),
+                             {"desde": desde, "hasta": hasta, "largo": largo, "sufijo": sufijo})
+            conn.execute(
+                "INSERT INTO marcas (fuente, ultimo_id, actualizado) VALUES (?, ?, ?) "
+                "ON CONFLICT (fuente) DO UPDATE SET ultimo_id = excluded.ultimo_id, "
+                "actualizado = excluded.actualizado",
+                (fuente, hasta, datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"))
+            )
+        total += hasta - desde
+        desde = hasta
+    return total
+
+
+def aggregate(path=DB_PATH, chunk_rows=CHUNK_ROWS):
+    # Ne lit que les événements postérieurs à la marque de chaque source
+    conn = connect(path)
+    try:
+        _load_specialties(conn)
+        processed = {}
+        for fuente, source_path in (("eventos", stats_store.DB_PATH), ("mensajes", contact_store.DB_PATH)):
+            if not os.path.exists(source_path):
+                continue
+            schema = FUENTES[fuente][0]
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (source_path,))
+            try:
+                processed[fuente] = _aggregate_source(conn, fuente, chunk_rows)
+            except sqlite3.OperationalError:
+                # Base source encore sans table
+                processed[fuente] = 0
+            finally:
+                conn.execute(f"DETACH DATABASE {schema}")
+        return processed
+    finally:
+        conn.close()
+
+# =============================================
+# LECTURE ET SOUS-ECHANTILLONNAGE
+# =============================================
+
+def load_series(serie, granularidad="hora", desde=None, path=DB_PATH):
+    import pandas as pd
+
+    tabla, largo, _, _ = GRANULARIDADES[granularidad]
+    conn = connect(path)
+    try:
+        query = f"SELECT clave, periodo, n, suma, minimo, maximo FROM {tabla} WHERE serie = ?"
+        params = [serie]
+        if desde is not None:
+            query += " AND periodo >= ?"
+            params.append(desde.isoformat()[:largo])
+        frame = pd.read_sql_query(query + " ORDER BY periodo", conn, params=params)
+    finally:
+        conn.close()
+    frame["periodo"] = pd.to_datetime(frame["periodo"], format="ISO8601")
+    return frame
+
+
+def downsample(frame, granularidad="hora", max_points=MAX_PUNTOS):
+    # Regroupe les périodes en pas plus larges : au plus max_points par clé.
+    # Les sommes restent exactes (n, suma), min/max gardent l'enveloppe.
+    if frame.empty:
+        return frame
+    base = GRANULARIDADES[granularidad][3]
+    span = frame["periodo"].max() - frame["periodo"].min()
+    pasos = max(1, math.ceil(span / base / max_points))
+    if pasos == 1 and frame.groupby("clave").size().max() <= max_points:
+        return frame
+    return (
+        frame.groupby(["clave", frame["periodo"].dt.floor(base * pasos)])
+        .agg(n=("n", "sum"), suma=("suma", "sum"), minimo=("minimo", "min"), maximo=("maximo", "max"))
+        .reset_index()
+    )
+
+
+def last_update(path=DB_PATH):
+    conn = connect(path)
+    try:
+        return dict(conn.execute("SELECT fuente, actualizado FROM marcas"))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agregación horaria y diaria de eventos y contactos")
+    parser.add_argument("--loop", action="store_true", help=f"Repite cada {LOOP_INTERVAL:.0f} s")
+    parser.add_argument("--interval", type=float, default=LOOP_INTERVAL)
+    args = parser.parse_args()
+    while True:
+        start = time.perf_counter()
+        processed = aggregate()
+        print(f"{processed} en {time.perf_counter() - start:.2f} s", flush=True)
+        if not args.loop:
+            break
+        time.sleep(args.interval)
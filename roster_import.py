@@ -0,0 +1,481 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import catalog
+from agenda import SLOT_MINUTES
+from search_index import fold
+
+# =============================================
+# CONFIGURATION DE L'IMPORT
+# =============================================
+# Usage : python roster_import.py plantel.xlsx [--dry-run] [--strict]
+#
+# Chaque feuille est reconnue à ses en-têtes : profesionales (matricula,
+# nombre, especialidad, exp, ...) ou horarios (matricula, dia, desde, hasta).
+# Lecture openpyxl en read_only, ligne par ligne : la mémoire ne dépend pas
+# de la taille du classeur. Les lignes valides sont mises de côté par lots
+# dans des tables temporaires (fichier temporaire de SQLite), puis fusionnées
+# dans le catalogue en une seule transaction courte, upsert sur la matrícula.
+# Le catalogue n'est modifié (et rechargé par l'application) qu'une fois.
+
+# Lignes validées puis mises de côté par lot
+CHUNK_ROWS = 2000
+# Erreurs conservées pour le rapport (toutes sont comptées)
+MAX_ERRORES = 500
+
+PROFESIONALES = "profesionales"
+HORARIOS = "horarios"
+
+# Colonnes obligatoires et facultatives par type de feuille
+HOJAS = {
+    PROFESIONALES: (("matricula", "nombre", "especialidad", "exp"), ("universidad", "img", "lat", "lon")),
+    HORARIOS: (("matricula", "dia", "desde", "hasta"), ()),
+}
+
+# En-tête normalisé (sans accents ni casse) -> colonne
+ALIAS = {
+    "matricula": "matricula",
+    "nombre": "nombre",
+    "especialidad": "especialidad",
+    "exp": "exp",
+    "experiencia": "exp",
+    "anos de experiencia": "exp",
+    "universidad": "universidad",
+    "img": "img",
+    "imagen": "img",
+    "foto": "img",
+    "lat": "lat",
+    "latitud": "lat",
+    "lon": "lon",
+    "longitud": "lon",
+    "dia": "dia",
+    "desde": "desde",
+    "inicio": "desde",
+    "hasta": "hasta",
+    "fin": "hasta",
+}
+
+# Foto : URL http(s) o nombre de archivo dentro de la carpeta de imágenes
+IMG_ARCHIVO = re.compile(r"^\w[\w.-]*$")
+
+DIAS = {"lunes": 0, "martes": 1, "miercoles": 2, "jueves": 3, "viernes": 4, "sabado": 5, "domingo": 6}
+
+STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS stage_doctores (
+    fila INTEGER NOT NULL,
+    matricula TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    especialidad TEXT NOT NULL,
+    exp INTEGER NOT NULL,
+    universidad TEXT,
+    img TEXT,
+    lat REAL,
+    lon REAL
+);
+CREATE TEMP TABLE IF NOT EXISTS stage_horarios (
+    hoja TEXT NOT NULL,
+    fila INTEGER NOT NULL,
+    matricula TEXT NOT NULL,
+    dia INTEGER NOT NULL,
+    inicio INTEGER NOT NULL,
+    fin INTEGER NOT NULL
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+# =============================================
+# VALIDATION DES CELLULES
+# =============================================
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Matrícula saisie comme nombre dans Excel
+        value = int(value)
+    return str(value).strip()
+
+
+def _required(value):
+    text = _text(value)
+    if not text:
+        raise ValueError("obligatorio")
+    return text
+
+
+def _optional(value):
+    return _text(value) or None
+
+
+def _img(value):
+    text = _text(value)
+    if not text:
+        return None
+    if text.startswith(("http://", "https://")):
+        if urlsplit(text).netloc and not any(c.isspace() for c in text):
+            return text
+    elif IMG_ARCHIVO.match(text) and ".." not in text:
+        return text
+    raise ValueError(f"imagen inválida ({value!r}): URL http(s) o nombre de archivo")
+
+
+def _number(text, value):
+    # Acepta la coma decimal
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        raise ValueError(f"no es un número ({value!r})") from None
+
+
+def _exp(value):
+    years = _number(_required(value), value)
+    if not years.is_integer() or not 0 <= years <= 70:
+        raise ValueError(f"fuera de rango ({value!r})")
+    return int(years)
+
+
+def _coordinate(limit):
+    def parse(value):
+        text = _text(value)
+        if not text:
+            return None
+        number = _number(text, value)
+        if not -limit <= number <= limit:
+            raise ValueError(f"fuera de rango ({number})")
+        return number
+    return parse
+
+
+def _dia(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Numeración ISO : 1 = lunes ... 7 = domingo
+        if value == int(value) and 1 <= value <= 7:
+            return int(value) - 1
+        raise ValueError(f"día inválido ({value!r})")
+    dia = DIAS.get(fold(_required(value)))
+    if dia is None:
+        raise ValueError(f"día inválido ({value!r})")
+    return dia
+
+
+def _hora(value):
+    # Minutes depuis minuit ; Excel donne des time, des datetime ou une
+    # fraction de journée selon le format de la cellule
+    if isinstance(value, datetime.datetime):
+        value = value.time()
+    if isinstance(value, datetime.time):
+        # Arrondi à la minute : 0,375 peut revenir en 08:59:59.999
+        minutes = round((value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6) / 60)
+    elif isinstance(value, float):
+        # 1,0 et au-delà (date + heure) ne sont pas une heure ; 24:00 s'écrit en texte
+        if not 0 <= value < 1:
+            raise ValueError(f"hora inválida ({value!r})")
+        minutes = round(value * 24 * 60)
+    else:
+        # HH, HH:MM o HH:MM:SS
+        text = _required(value)
+        parts = text.split(":")
+        try:
+            hours, mins, secs = (int(part) for part in parts + ["0"] * (3 - len(parts)))
+        except ValueError:
+            raise ValueError(f"hora inválida ({value!r})") from None
+        if len(parts) > 3 or not 0 <= mins < 60 or not 0 <= secs < 60 or secs:
+            raise ValueError(f"hora inválida ({value!r})")
+        minutes = hours * 60 + mins
+    if not 0 <= minutes <= 24 * 60:
+        raise ValueError(f"hora inválida ({value!r})")
+    if minutes % SLOT_MINUTES:
+        raise ValueError(f"debe ser múltiplo de {SLOT_MINUTES} minutos")
+    return minutes
+
+
+PARSERS = {
+    "matricula": _required,
+    "nombre": _required,
+    "especialidad": _required,
+    "exp": _exp,
+    "universidad": _optional,
+    "img": _img,
+    "lat": _coordinate(90),
+    "lon": _coordinate(180),
+    "dia": _dia,
+    "desde": _hora,
+    "hasta": _hora,
+}
+
+
+def _columns(header):
+    # Position de chaque colonne reconnue et type de feuille, ou None
+    positions = {}
+    for i, name in enumerate(header):
+        column = ALIAS.get(" ".join(fold(_text(name)).split()))
+        if column is not None and column not in positions:
+            positions[column] = i
+    for tipo, (required, _) in HOJAS.items():
+        if all(column in positions for column in required):
+            return tipo, positions
+    return None, positions
+
+
+def _parse(tipo, positions, row):
+    required, optional = HOJAS[tipo]
+    values = []
+    for column in required + optional:
+        position = positions.get(column)
+        raw = row[position] if position is not None and position < len(row) else None
+        try:
+            values.append(PARSERS[column](raw))
+        except ValueError as exc:
+            raise ValueError(f"{column}: {exc}") from None
+    if tipo == HORARIOS and values[2] >= values[3]:
+        raise ValueError("desde: debe ser anterior a hasta")
+    return values
+
+# =============================================
+# LECTURE EN FLUX
+# =============================================
+
+class Report:
+    def __init__(self):
+        self.hojas = {}
+        self.errores = []
+        self.total_errores = 0
+
+    def error(self, hoja, fila, mensaje):
+        self.total_errores += 1
+        if len(self.errores) < MAX_ERRORES:
+            self.errores.append({"hoja": hoja, "fila": fila, "error": mensaje})
+
+
+def _stage(conn, tipo, hoja, lote, report):
+    if tipo == HORARIOS:
+        conn.executemany("INSERT INTO stage_horarios VALUES (?, ?, ?, ?, ?, ?)", [[hoja] + row for row in lote])
+        return len(lote)
+    # Matrícula repetida dans le fichier : déjà vue dans ce lot ou un précédent
+    unique = {}
+    for row in lote:
+        if row[1] in unique:
+            report.error(hoja, row[0], f"matricula: repetida (fila {unique[row[1]][0]})")
+        else:
+            unique[row[1]] = row
+    keys = list(unique)
+    placeholders = ", ".join("?" for _ in keys)
+    for matricula, fila in conn.execute(
+            f"SELECT matricula, fila FROM stage_doctores WHERE matricula IN ({placeholders})", keys).fetchall():
+        report.error(hoja, unique.pop(matricula)[0], f"matricula: repetida (fila {fila})")
+    conn.executemany("INSERT INTO stage_doctores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", list(unique.values()))
+    return len(unique)
+
+
+def _read_sheet(conn, sheet, report, progress):
+    hoja = sheet.title
+    rows = sheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    tipo, positions = _columns(header or ())
+    if tipo is None:
+        esperados = " o ".join(", ".join(required) for required, _ in HOJAS.values())
+        report.error(hoja, 1, f"encabezados no reconocidos (se esperan: {esperados})")
+        return
+    total = sheet.max_row
+    resumen = report.hojas[hoja] = {"tipo": tipo, "filas": 0, "validas": 0}
+    lote = []
+    fila = 1
+    for fila, row in enumerate(rows, start=2):
+        if all(value is None or value == "" for value in row):
+            continue
+        resumen["filas"] += 1
+        try:
+            lote.append([fila] + _parse(tipo, positions, row))
+        except ValueError as exc:
+            report.error(hoja, fila, str(exc))
+        if len(lote) >= CHUNK_ROWS:
+            resumen["validas"] += _stage(conn, tipo, hoja, lote, report)
+            lote = []
+            if progress is not None:
+                progress(hoja, fila, total)
+    if lote:
+        resumen["validas"] += _stage(conn, tipo, hoja, lote, report)
+    if progress is not None:
+        progress(hoja, fila, total or fila)
+
+# =============================================
+# FUSION DANS LE CATALOGUE
+# =============================================
+
+def _orphan_schedules(conn, report):
+    # Horarios de una matrícula que no está en el catálogo ni en el archivo
+    orphans = conn.execute(
+        "SELECT hoja, fila, matricula FROM stage_horarios "
+        "WHERE matricula NOT IN (SELECT matricula FROM doctores) "
+        "AND matricula NOT IN (SELECT matricula FROM stage_doctores) ORDER BY rowid"
+    )
+    for hoja, fila, matricula in orphans:
+        report.error(hoja, fila, f"matricula: {matricula} no existe")
+    conn.execute(
+        "DELETE FROM stage_horarios "
+        "WHERE matricula NOT IN (SELECT matricula FROM doctores) "
+        "AND matricula NOT IN (SELECT matricula FROM stage_doctores)"
+    )
+
+
+def _merge(conn):
+    actualizados = conn.execute(
+        "SELECT COUNT(*) FROM stage_doctores WHERE matricula IN (SELECT matricula FROM doctores)"
+    ).fetchone()[0]
+    total = conn.execute("SELECT COUNT(*) FROM stage_doctores").fetchone()[0]
+    # Les colonnes facultatives vides gardent la valeur du catalogue
+    conn.execute("""
+        INSERT INTO doctores (matricula, nombre, especialidad, exp, universidad, img, lat, lon)
+        SELECT matricula, nombre, especialidad, exp, universidad, COALESCE(img, ''), lat, lon
+        FROM stage_doctores WHERE true
+        ON CONFLICT (matricula) DO UPDATE SET
+            nombre = excluded.nombre,
+            especialidad = excluded.especialidad,
+            exp = excluded.exp,
+            universidad = COALESCE(excluded.universidad, doctores.universidad),
+            img = COALESCE(NULLIF(excluded.img, ''), doctores.img),
+            lat = COALESCE(excluded.lat, doctores.lat),
+            lon = COALESCE(excluded.lon, doctores.lon)
+        -- Ligne inchangée : ni écriture ni nouvelle version de la table
+        WHERE (doctores.nombre, doctores.especialidad, doctores.exp, doctores.universidad,
+               doctores.img, doctores.lat, doctores.lon)
+        IS NOT (excluded.nombre, excluded.especialidad, excluded.exp,
+                COALESCE(excluded.universidad, doctores.universidad),
+                COALESCE(NULLIF(excluded.img, ''), doctores.img),
+                COALESCE(excluded.lat, doctores.lat), COALESCE(excluded.lon, doctores.lon))
+    """)
+    # L'horaire importé remplace tout l'horaire du médecin
+    conn.execute("""
+        DELETE FROM horarios WHERE doctor_id IN (
+            SELECT d.id FROM doctores d JOIN stage_horarios s ON s.matricula = d.matricula)
+    """)
+    horarios = conn.execute("""
+        INSERT OR REPLACE INTO horarios (doctor_id, dia, inicio, fin)
+        SELECT d.id, s.dia, s.inicio, s.fin
+        FROM stage_horarios s JOIN doctores d ON d.matricula = s.matricula
+        ORDER BY s.rowid
+    """).rowcount
+    return {"nuevos": total - actualizados, "actualizados": actualizados, "horarios": horarios}
+
+
+def import_workbook(path, db_path=catalog.DB_PATH, dry_run=False, strict=False, progress=None):
+    # Import paresseux : openpyxl n'est chargé que pour un import
+    from openpyxl import load_workbook
+
+    catalog.init_db(db_path)
+    report = Report()
+    started = time.perf_counter()
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    conn = catalog.connect(db_path)
+    try:
+        # Tables de travail sur disque, hors du fichier du catalogue
+        conn.execute("PRAGMA temp_store = FILE")
+        conn.executescript(STAGING)
+        for sheet in workbook.worksheets:
+            _read_sheet(conn, sheet, report, progress)
+        _orphan_schedules(conn, report)
+        conn.commit()
+
+        resultado = {"nuevos": 0, "actualizados": 0, "horarios": 0}
+        importado = not dry_run and not (strict and report.total_errores)
+        if importado:
+            with conn:
+                resultado = _merge(conn)
+    finally:
+        workbook.close()
+        conn.close()
+
+    return {
+        "hojas": report.hojas,
+        "importado": importado,
+        **resultado,
+        "total_errores": report.total_errores,
+        "errores": report.errores,
+        "segundos": round(time.perf_counter() - started, 2),
+    }
+
+# =============================================
+# IMPORT EN ARRIERE-PLAN
+# =============================================
+
+EN_CURSO = "en_curso"
+TERMINADO = "terminado"
+FALLIDO = "fallido"
+
+
+class ImportJob:
+    def __init__(self, path, nombre, strict=False, remove=True):
+        self.path = path
+        self.nombre = nombre
+        self.strict = strict
+        self.remove = remove
+        self.estado = EN_CURSO
+        self.hoja = None
+        self.fila = 0
+        self.total = None
+        self.report = None
+        self.error = None
+        self.started = time.time()
+        self._thread = threading.Thread(target=self._run, name="roster-import", daemon=True)
+
+    def _progress(self, hoja, fila, total):
+        self.hoja, self.fila, self.total = hoja, fila, total
+
+    def _run(self):
+        try:
+            self.report = import_workbook(self.path, strict=self.strict, progress=self._progress)
+            self.estado = TERMINADO
+        except Exception as exc:
+            logger.exception("Import of %s failed", self.nombre)
+            self.error = str(exc)
+            self.estado = FALLIDO
+        finally:
+            if self.remove:
+                os.remove(self.path)
+
+    @property
+    def activo(self):
+        return self.estado == EN_CURSO
+
+
+_job = None
+_job_lock = threading.Lock()
+
+
+def start_import(path, nombre, strict=False):
+    # Un seul import à la fois par processus : ils écrivent dans le même catalogue
+    global _job
+    with _job_lock:
+        if _job is not None and _job.activo:
+            return None
+        _job = ImportJob(path, nombre, strict)
+        _job._thread.start()
+        return _job
+
+
+def current_import():
+    return _job
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa profesionales y horarios desde un Excel")
+    parser.add_argument("archivo", help="Libro .xlsx con hojas de profesionales y/o horarios")
+    parser.add_argument("--dry-run", action="store_true", help="Solo valida, no modifica el catálogo")
+    parser.add_argument("--strict", action="store_true", help="No importa nada si hay errores")
+    args = parser.parse_args()
+
+    def _print_progress(hoja, fila, total):
+        print(f"{hoja}: fila {fila}" + (f" de {total}" if total else ""), file=sys.stderr)
+
+    result = import_workbook(args.archivo, dry_run=args.dry_run, strict=args.strict, progress=_print_progress)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    sys.exit(1 if result["total_errores"] else 0)
@@ -0,0 +1,98 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+
+# =============================================
+# NORMALISATION DU TEXTE
+# =============================================
+
+_TOKEN = re.compile(r"\w+")
+
+# Champs indexés pour chaque article
+CHAMPS = ("titulo", "resumen", "tags", "autor")
+
+# Au-delà, le résultat n'est pas trié mais parcouru dans l'ordre du catalogue
+_SORT_LIMIT = 4096
+
+
+def fold(text):
+    # "Nutrición" -> "nutricion"
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return _TOKEN.findall(fold(text))
+
+# =============================================
+# INDEX INVERSE
+# =============================================
+
+class ArticleIndex:
+    def __init__(self, articulos):
+        postings = {}
+        categories = {}
+        for doc_id, articulo in enumerate(articulos):
+            for champ in CHAMPS:
+                valeur = getattr(articulo, champ)
+                textes = valeur if isinstance(valeur, (list, tuple)) else (valeur,)
+                for texte in textes:
+                    for token in tokenize(texte):
+                        postings.setdefault(token, set()).add(doc_id)
+            categories.setdefault(articulo.categoria, []).append(doc_id)
+
+        self.size = len(articulos)
+        self.postings = {token: frozenset(ids) for token, ids in postings.items()}
+        self.vocabulary = sorted(self.postings)
+        self.categories = {cat: frozenset(ids) for cat, ids in categories.items()}
+        self._ordered_categories = {cat: tuple(ids) for cat, ids in categories.items()}
+        self._prefix = lru_cache(maxsize=1024)(self._expand_prefix)
+
+    def _expand_prefix(self, prefix):
+        # Le dernier mot est souvent en cours de frappe : on accepte les préfixes
+        start = bisect_left(self.vocabulary, prefix)
+        matches = []
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.append(self.postings[token])
+        if len(matches) == 1:
+            return matches[0]
+        return frozenset().union(*matches)
+
+    def search(self, query="", category=None):
+        tokens = tokenize(query) if query else []
+        if not tokens:
+            if category is None:
+                return range(self.size)
+            return self._ordered_categories.get(category, ())
+
+        candidates = [self._prefix(token) for token in dict.fromkeys(tokens)]
+        if category is not None:
+            candidates.append(self.categories.get(category, frozenset()))
+        candidates.sort(key=len)
+
+        result = candidates[0]
+        for posting in candidates[1:]:
+            if not result:
+                break
+            result = result & posting
+        if len(result) <= _SORT_LIMIT:
+            return sorted(result)
+        # Gros résultat : parcours paresseux dans l'ordre du catalogue,
+        # seuls les éléments réellement consommés sont visités
+        return filter(result.__contains__, range(self.size))
+
+
+_INDEXES = {}
+
+
+def article_index(version, articulos):
+    # Un seul index par version du contenu, partagé par toutes les sessions
+    index = _INDEXES.get(version)
+    if index is None:
+        index = ArticleIndex(articulos)
+        _INDEXES.clear()
+        _INDEXES[version] = index
+    return index
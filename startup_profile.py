@@ -0,0 +1,85 @@
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+# =============================================
+# PROFIL DE DEMARRAGE
+# =============================================
+# Usage : python startup_profile.py [--top 20]
+#
+# 1. Démarrage à froid : coût de l'import de MainFILE, puis coût
+#    supplémentaire de chaque page au premier affichage.
+# 2. Détail par paquet (python -X importtime) de tous les imports.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _phases():
+    # Exécuté dans un interpréteur neuf : mesure chaque étape dans l'ordre
+    sys.path.insert(0, BASE_DIR)
+    results = []
+    before = set(sys.modules)
+    start = time.perf_counter()
+    main = importlib.import_module("MainFILE")
+    results.append(("MainFILE", time.perf_counter() - start, len(set(sys.modules) - before)))
+    for option, (_, module, _) in main.PAGINAS.items():
+        before = set(sys.modules)
+        start = time.perf_counter()
+        importlib.import_module(module)
+        results.append((f"{option} ({module})", time.perf_counter() - start, len(set(sys.modules) - before)))
+    print(json.dumps(results))
+
+
+def _run_phases():
+    output = subprocess.run(
+        [sys.executable, __file__, "--phases"],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _run_importtime():
+    code = (
+        "import MainFILE, importlib\n"
+        "for _, module, _ in MainFILE.PAGINAS.values(): importlib.import_module(module)\n"
+    )
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def report(top=20):
+    print("Arranque en frío (primer import de cada página)")
+    print(f"{'etapa':<45}{'ms':>10}{'módulos':>10}")
+    for name, seconds, modules in _run_phases():
+        print(f"{name:<45}{seconds * 1000:>10.1f}{modules:>10}")
+
+    print()
+    print(f"Tiempo propio por paquete (top {top}, -X importtime)")
+    print(f"{'paquete':<45}{'ms':>10}")
+    for package, micros in _run_importtime()[:top]:
+        print(f"{package:<45}{micros / 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil de arranque de MediPedido")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--phases", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.phases:
+        _phases()
+    else:
+        report(args.top)
@@ -0,0 +1,265 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from assets import stylesheet
+from componentes import (ESPECIALIDAD_CARD, PAGE_HEADER, PASO_CARD, SECTION_HEADING, STAT_CARD,
+                         article_card, catalog, doctor_card, service_card)
+from directory import directory
+from images import THUMBS_DIR, THUMBS_URL
+from templates import Markup, Template
+
+# =============================================
+# CONFIGURATION DE L'EXPORT
+# =============================================
+# Usage : python static_site.py [--out site] [--app-url /app/] [--force]
+#
+# Pages publiques rendues avec les mêmes gabarits que l'application, en
+# HTML statique. Seules les pages dont les données ou les gabarits ont
+# changé sont régénérées (manifest.json : clé d'entrée + hash du contenu).
+# La recherche, le contact et les réservations restent dans Streamlit.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BASE_DIR, "site")
+APP_URL = os.environ.get("MEDIPEDIDO_APP_URL", "/app/")
+MANIFEST = "manifest.json"
+
+# Plus de cartes par page qu'en direct : pas de rerun à chaque page
+PROFESIONALES_POR_PAGINA = 48
+ARTICULOS_POR_PAGINA = 20
+
+# Toute modification de ces fichiers invalide toutes les pages (gabarits,
+# URL des miniatures, ordre de l'annuaire)
+BUILD_SOURCES = ("componentes.py", "templates.py", "static_site.py", "paginas/inicio.py", "images.py",
+                 "directory.py")
+
+LAYOUT = Template("""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{titulo} · MediPedido</title>
+<link rel="stylesheet" href="{css}">
+</head>
+<body class="static-site">
+<nav class="static-nav">{nav}</nav>
+<main>{contenido}</main>
+</body>
+</html>
+""")
+
+NAV_LINK = Template('<a href="{href}" class="{clase}">{texto}</a>')
+GRID = Template('<div class="static-grid cols-{cols}">{items}</div>')
+CTA = Template('<p class="static-cta"><a class="pill-button" href="{href}">{texto}</a></p>')
+PAGER_LINK = Template('<a class="pill-button" href="{href}">{texto}</a>')
+
+SECCIONES = (
+    ("Inicio", "index.html"),
+    ("Servicios", "servicios.html"),
+    ("Profesionales", "profesionales.html"),
+    ("Blog", "blog.html"),
+)
+
+# =============================================
+# PAGES
+# =============================================
+
+def _nav(actual, app_url):
+    links = [NAV_LINK.render(href=href, clase="active" if nombre == actual else "", texto=nombre)
+             for nombre, href in SECCIONES]
+    links.append(NAV_LINK.render(href=app_url, clase="", texto="Contacto"))
+    return Markup("".join(links))
+
+
+def _grid(items, cols):
+    return GRID.render(cols=cols, items=Markup("".join(items)))
+
+
+def _page_name(base, page):
+    return f"{base}.html" if page == 0 else f"{base}-{page + 1}.html"
+
+
+def _pager(base, page, pages):
+    if pages <= 1:
+        return Markup("")
+    links = []
+    if page > 0:
+        links.append(PAGER_LINK.render(href=_page_name(base, page - 1), texto="← Anterior"))
+    links.append(Markup(f"<span class='page-indicator'>Página {page + 1} de {pages}</span>"))
+    if page + 1 < pages:
+        links.append(PAGER_LINK.render(href=_page_name(base, page + 1), texto="Siguiente →"))
+    return Markup(f"<div class='static-pager'>{''.join(links)}</div>")
+
+
+def _inicio(stats):
+    return Markup("".join((
+        PAGE_HEADER.render(variant="hero", titulo="Bienvenido a MediPedido",
+                           subtitulo="La revolución en atención médica domiciliaria en Argentina"),
+        _grid([STAT_CARD.render(**stat) for stat in stats], 4),
+    )))
+
+
+def _servicios(servicios, pasos, app_url):
+    return Markup("".join((
+        PAGE_HEADER.render(variant="", titulo="Nuestros Servicios Médicos",
+                           subtitulo="Atención profesional cuando y donde la necesites"),
+        _grid([service_card(servicio, delay=i * 200) for i, servicio in enumerate(servicios)], 3),
+        Markup('<div class="section-title"><h2>¿Cómo funciona MediPedido?</h2></div>'),
+        _grid([PASO_CARD.render(icon=paso.icon, title=paso.title, desc=paso.desc) for paso in pasos], 4),
+        CTA.render(href=app_url, texto="🚑 Solicitar un médico a domicilio"),
+    )))
+
+
+def _profesionales(doctores, especialidades, page, pages, app_url):
+    parts = [
+        PAGE_HEADER.render(variant="", titulo="Nuestro Equipo Médico",
+                           subtitulo="Profesionales certificados y con amplia experiencia"),
+        SECTION_HEADING.render(variant="", titulo="Nuestros Profesionales"),
+        CTA.render(href=app_url, texto="Buscar y pedir cita"),
+        _grid([doctor_card(name=d.nombre, specialty=d.especialidad, experience=d.exp,
+                           img_url=d.img, delay=(i % 3) * 200)
+               for i, d in enumerate(doctores)], 3),
+        _pager("profesionales", page, pages),
+    ]
+    if page == 0:
+        parts.append(SECTION_HEADING.render(variant="spaced", titulo="Todas Nuestras Especialidades"))
+        parts.append(_grid([ESPECIALIDAD_CARD.render(icon=esp.icon, nombre=esp.nombre) for esp in especialidades], 3))
+    return Markup("".join(parts))
+
+
+def _blog(articulos, page, pages, app_url):
+    return Markup("".join((
+        PAGE_HEADER.render(variant="", titulo="Blog de Salud MediPedido",
+                           subtitulo="Consejos médicos y novedades para tu bienestar"),
+        CTA.render(href=app_url, texto="🔍 Buscar artículos"),
+        Markup("".join(article_card(articulo, delay=i * 150) for i, articulo in enumerate(articulos))),
+        _pager("blog", page, pages),
+    )))
+
+
+def _chunks(items, size):
+    # Au moins une page, même vide
+    return [items[i:i + size] for i in range(0, len(items), size)] or [[]]
+
+
+def pages(app_url):
+    # (fichier, titre, section, entrées, rendu) ; les entrées seules décident
+    # si la page doit être régénérée
+    from paginas.inicio import home_stats
+
+    stats = home_stats()
+    yield "index.html", "Inicio", "Inicio", stats, lambda: _inicio(stats)
+
+    servicios, pasos = catalog.servicios(), catalog.pasos()
+    yield ("servicios.html", "Servicios", "Servicios", (servicios, pasos),
+           lambda: _servicios(servicios, pasos, app_url))
+
+    version, doctores, especialidades = catalog.snapshot("doctores", "especialidades")
+    orden = [doctores[i] for i in directory(version, doctores).query()]
+    bloques = _chunks(orden, PROFESIONALES_POR_PAGINA)
+    for page, bloque in enumerate(bloques):
+        entradas = (bloque, especialidades if page == 0 else None, len(bloques))
+        yield (_page_name("profesionales", page), "Profesionales", "Profesionales", entradas,
+               lambda bloque=bloque, page=page, total=len(bloques):
+                   _profesionales(bloque, especialidades, page, total, app_url))
+
+    bloques = _chunks(catalog.articulos(), ARTICULOS_POR_PAGINA)
+    for page, bloque in enumerate(bloques):
+        yield (_page_name("blog", page), "Blog", "Blog", (bloque, len(bloques)),
+               lambda bloque=bloque, page=page, total=len(bloques): _blog(bloque, page, total, app_url))
+
+# =============================================
+# CONSTRUCTION INCREMENTALE
+# =============================================
+
+def _digest(value):
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _build_salt(css_name, app_url):
+    sources = hashlib.sha256()
+    for name in BUILD_SOURCES:
+        with open(os.path.join(BASE_DIR, name), "rb") as f:
+            sources.update(f.read())
+    return _digest([sources.hexdigest(), css_name, app_url])
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w" if isinstance(content, str) else "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _publish_thumbs(html, out_dir):
+    # Miniatures servies par Streamlit (app/static/thumbs) -> copie locale thumbs/
+    for name in set(re.findall(re.escape(THUMBS_URL) + r"/([\w.-]+)", html)):
+        target = os.path.join(out_dir, "thumbs", name)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(os.path.join(THUMBS_DIR, name), target)
+    return html.replace(f"{THUMBS_URL}/", "thumbs/")
+
+
+def build(out_dir=OUT_DIR, app_url=APP_URL, force=False):
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    previous = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f)
+
+    href, css = stylesheet()
+    css_name = os.path.basename(href)
+    css_path = os.path.join(out_dir, "css", css_name)
+    if not os.path.exists(css_path):
+        _write(css_path, css)
+    salt = _build_salt(css_name, app_url)
+
+    manifest = {}
+    written = skipped = 0
+    for filename, titulo, seccion, entradas, render in pages(app_url):
+        key = _digest([salt, entradas])
+        path = os.path.join(out_dir, filename)
+        old = previous.get(filename)
+        if old and old["key"] == key and os.path.exists(path):
+            manifest[filename] = old
+            skipped += 1
+            continue
+        html = LAYOUT.render(titulo=titulo, css=f"css/{css_name}", nav=_nav(seccion, app_url), contenido=render())
+        html = _publish_thumbs(html, out_dir)
+        content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        if not (old and old["sha256"] == content_hash and os.path.exists(path)):
+            _write(path, html)
+            written += 1
+        else:
+            skipped += 1
+        manifest[filename] = {"key": key, "sha256": content_hash}
+
+    # Pages disparues (moins de pages de liste) et anciennes feuilles de style
+    removed = 0
+    for filename in set(previous) - set(manifest):
+        path = os.path.join(out_dir, filename)
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+    css_dir = os.path.dirname(css_path)
+    for name in os.listdir(css_dir):
+        if name != css_name:
+            os.remove(os.path.join(css_dir, name))
+
+    _write(manifest_path, json.dumps(manifest, indent=1, sort_keys=True))
+    return {"escritas": written, "sin_cambios": skipped, "eliminadas": removed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta las páginas públicas a HTML estático")
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--app-url", default=APP_URL, help="URL de la app Streamlit (búsqueda, citas, contacto)")
+    parser.add_argument("--force", action="store_true", help="Regenera todas las páginas")
+    args = parser.parse_args()
+    print(build(args.out, args.app_url, args.force))
@@ -0,0 +1,191 @@
+import datetime
+import logging
+import os
+import sqlite3
+import sys
+import threading
+
+from write_behind import WriteBehind
+
+# =============================================
+# CONFIGURATION
+# =============================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get("MEDIPEDIDO_DATA_DIR", os.path.join(BASE_DIR, "data"))
+DB_PATH = os.path.join(DATA_DIR, "eventos.db")
+
+QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+COMMIT_INTERVAL = 0.5
+# Rattrapage des événements écrits par d'autres processus
+REFRESH_INTERVAL = 5.0
+
+# Types d'événements : visite à domicile effectuée, note du patient (1 à 5),
+# médecin envoyé à domicile (valor = délai d'arrivée estimé en minutes)
+VISITA = "visita"
+VALORACION = "valoracion"
+DESPACHO = "despacho"
+# Note à partir de laquelle le patient est considéré satisfait
+NOTA_SATISFECHO = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eventos (
+    id INTEGER PRIMARY KEY,
+    creado TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    doctor_id INTEGER,
+    valor INTEGER
+);
+CREATE TABLE IF NOT EXISTS resumen (
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+"""
+
+# Compteurs matérialisés dans la table resumen
+CLAVES = ("ultimo_evento", "visitas", "valoraciones", "satisfechos")
+
+# Agrégat des seuls événements postérieurs au dernier appliqué (parcours de la clé primaire)
+DELTA = f"""
+SELECT MAX(id),
+       SUM(tipo = '{VISITA}'),
+       SUM(tipo = '{VALORACION}'),
+       SUM(tipo = '{VALORACION}' AND valor >= {NOTA_SATISFECHO})
+FROM eventos WHERE id > ?
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load_snapshot(conn):
+    totals = dict.fromkeys(CLAVES, 0)
+    totals.update(conn.execute("SELECT clave, valor FROM resumen"))
+    return totals
+
+
+def apply_delta(conn, totals):
+    # Ajoute aux compteurs les événements id > ultimo_evento et persiste
+    # l'instantané dans la même transaction
+    last, visitas, valoraciones, satisfechos = conn.execute(DELTA, (totals["ultimo_evento"],)).fetchone()
+    if last is None:
+        return totals
+    totals = {
+        "ultimo_evento": last,
+        "visitas": totals["visitas"] + visitas,
+        "valoraciones": totals["valoraciones"] + valoraciones,
+        "satisfechos": totals["satisfechos"] + satisfechos,
+    }
+    # Un autre processus a pu écrire un instantané plus récent : on ne recule jamais
+    conn.executemany(
+        "INSERT INTO resumen (clave, valor) VALUES (?, ?) "
+        "ON CONFLICT (clave) DO UPDATE SET valor = excluded.valor "
+        "WHERE (SELECT valor FROM resumen WHERE clave = 'ultimo_evento') < ?",
+        [(clave, totals[clave], last) for clave in CLAVES[1:]] + [("ultimo_evento", last, last)]
+    )
+    return totals
+
+
+def rebuild(path=DB_PATH):
+    # Réparation : recalcul complet depuis le journal (jamais sur le chemin de rendu)
+    conn = connect(path)
+    with conn:
+        conn.execute("DELETE FROM resumen")
+        totals = apply_delta(conn, dict.fromkeys(CLAVES, 0))
+    conn.close()
+    return totals
+
+# =============================================
+# COMPTEURS EN DIRECT
+# =============================================
+
+class LiveStats(WriteBehind):
+    def __init__(self, path=DB_PATH, queue_size=QUEUE_SIZE):
+        super().__init__("live-stats", queue_size, BATCH_SIZE, COMMIT_INTERVAL, idle_interval=REFRESH_INTERVAL)
+        self.path = path
+        self.dropped = 0
+        # Instantané immuable remplacé en bloc : la lecture ne prend aucun verrou
+        conn = connect(path)
+        with conn:
+            self.totals = apply_delta(conn, load_snapshot(conn))
+        conn.close()
+        self.start()
+
+    def record(self, tipo, doctor_id=None, valor=None):
+        event = (datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                 tipo, doctor_id, valor)
+        if not self.offer(event):
+            self.dropped += 1
+            return False
+        return True
+
+    # Producteurs : la visite une fois effectuée (pas à la réservation, qui
+    # n'est qu'une promesse) et la note laissée par le patient après la visite
+    def record_visit(self, doctor_id=None):
+        return self.record(VISITA, doctor_id)
+
+    def record_dispatch(self, doctor_id, minutos):
+        return self.record(DESPACHO, doctor_id, minutos)
+
+    def record_rating(self, valor, doctor_id=None):
+        if not 1 <= valor <= 5:
+            raise ValueError("La valoración va de 1 a 5")
+        return self.record(VALORACION, doctor_id, valor)
+
+    def _connect(self):
+        return connect(self.path)
+
+    def _write(self, conn, batch):
+        try:
+            with conn:
+                if batch:
+                    conn.executemany(
+                        "INSERT INTO eventos (creado, tipo, doctor_id, valor) VALUES (?, ?, ?, ?)",
+                        batch
+                    )
+                self.totals = apply_delta(conn, self.totals)
+        except sqlite3.Error:
+            logger.exception("No se pudieron guardar %d eventos", len(batch))
+
+    def _idle(self, conn):
+        # File vide : simple rattrapage des autres processus
+        self._write(conn, [])
+
+    # -- Lecture (O(1)) ---------------------------
+
+    def satisfaction(self):
+        totals = self.totals
+        if not totals["valoraciones"]:
+            return None
+        return totals["satisfechos"] / totals["valoraciones"]
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_stats():
+    # Un seul jeu de compteurs par processus
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = LiveStats()
+    return _stats
+
+
+if __name__ == "__main__":
+    # python stats_store.py rebuild
+    if sys.argv[1:] == ["rebuild"]:
+        print(rebuild())
+    else:
+        print("Uso: python stats_store.py rebuild")
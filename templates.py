@@ -0,0 +1,81 @@
+from functools import lru_cache
+from html import escape
+from string import Formatter
+
+# =============================================
+# MOTEUR DE FRAGMENTS HTML
+# =============================================
+
+# Nombre maximal de fragments rendus gardés en mémoire (par processus)
+CACHE_SIZE = 4096
+
+
+class Markup(str):
+    # HTML déjà sûr : n'est jamais ré-échappé
+    __slots__ = ()
+
+
+def _escape(value):
+    if isinstance(value, Markup):
+        return value
+    if value is None:
+        return ""
+    return escape(str(value), quote=True)
+
+
+class Template:
+    def __init__(self, source):
+        # Pré-compilation : segments statiques + noms des champs à insérer
+        self.segments = tuple(
+            (literal, field)
+            for literal, field, _, _ in Formatter().parse(source)
+        )
+        self.names = tuple(dict.fromkeys(
+            field for _, field in self.segments if field is not None
+        ))
+
+    def _render(self, values):
+        escaped = dict(zip(self.names, map(_escape, values)))
+        parts = []
+        for literal, field in self.segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(escaped[field])
+        return Markup("".join(parts))
+
+    def render(self, **values):
+        key = tuple(values[name] for name in self.names)
+        try:
+            return _render_cached(self, key, tuple(map(type, key)))
+        except TypeError:
+            # Valeur non hachable : rendu direct, sans cache
+            return self._render(key)
+
+    def render_each(self, name, items):
+        items = tuple(items)
+        try:
+            return _render_each_cached(self, name, items, tuple(map(type, items)))
+        except TypeError:
+            return Markup("".join(self.render(**{name: item}) for item in items))
+
+
+# La clé du cache est le contenu lui-même (gabarit + valeurs) : une carte
+# inchangée n'est jamais reconstruite ni ré-échappée. Les types font partie
+# de la clé : Markup("<b>") == "<b>" (et 1 == True == 1.0) n'ont pas le même rendu.
+@lru_cache(maxsize=CACHE_SIZE)
+def _render_cached(template, values, types):
+    return template._render(values)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _render_each_cached(template, name, items, types):
+    return Markup("".join(template.render(**{name: item}) for item in items))
+
+
+def cache_info():
+    return _render_cached.cache_info()
+
+
+def cache_clear():
+    _render_cached.cache_clear()
+    _render_each_cached.cache_clear()
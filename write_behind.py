@@ -0,0 +1,152 @@
+import abc
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+# =============================================
+# ECRITURE DIFFEREE PAR LOTS
+# =============================================
+# Un thread par écrivain : les sessions Streamlit déposent des lignes dans une
+# file bornée, le thread les regroupe (BATCH_SIZE lignes ou COMMIT_INTERVAL
+# secondes) et les écrit en une transaction. Les sous-classes fournissent
+# _connect() et _write(conn, batch) ; _idle(conn) est appelé quand la file
+# reste vide idle_interval secondes.
+
+# Attente entre deux tentatives d'ouverture de la base
+RETRY_INTERVAL = 2.0
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehind(abc.ABC):
+    def __init__(self, name, queue_size, batch_size, commit_interval, idle_interval=None):
+        self._queue = queue.Queue(queue_size)
+        self._closed = False
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.idle_interval = idle_interval
+        # Vrai tant que la base ne peut pas être ouverte
+        self.failing = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.close)
+
+    def offer(self, item, timeout=None):
+        # False si l'écrivain est fermé, si rien ne peut être écrit (thread
+        # arrêté, base inaccessible) ou si la file est encore pleine après timeout
+        if self._closed or self.failing or not self._thread.is_alive():
+            return False
+        try:
+            if timeout:
+                self._queue.put(item, timeout=timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def close(self, timeout=10):
+        if self._closed:
+            return
+        self._closed = True
+        deadline = time.monotonic() + timeout
+        try:
+            # File pleine : le thread la vide, mais on n'attend pas indéfiniment
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("%s: %d elementos sin guardar al cerrar", self._thread.name, self.pending())
+            return
+        self._thread.join(max(deadline - time.monotonic(), 0))
+
+    @abc.abstractmethod
+    def _connect(self):
+        pass
+
+    @abc.abstractmethod
+    def _write(self, conn, batch):
+        pass
+
+    def _idle(self, conn):
+        pass
+
+    def _next_batch(self):
+        # -> (lot, arrêt demandé) ; lot vide si la file est restée vide
+        try:
+            item = self._queue.get(timeout=self.idle_interval)
+        except queue.Empty:
+            return [], False
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.commit_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _open(self):
+        # Connexion, ou None (échec journalisé) : le thread réessaie sans mourir
+        try:
+            conn = self._connect()
+        except (sqlite3.Error, OSError):
+            if not self.failing:
+                logger.exception("%s: no se pudo abrir la base", self._thread.name)
+            self.failing = True
+            return None
+        if self.failing:
+            logger.info("%s: base disponible de nuevo", self._thread.name)
+        self.failing = False
+        return conn
+
+    def _run(self):
+        conn = self._open()
+        try:
+            stop = False
+            while not stop:
+                if conn is None:
+                    if self._closed:
+                        break
+                    time.sleep(RETRY_INTERVAL)
+                    conn = self._open()
+                    continue
+                batch, stop = self._next_batch()
+                if batch:
+                    self._write(conn, batch)
+                elif not stop:
+                    self._idle(conn)
+            # Vidage final avant l'arrêt du processus
+            rest = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    rest.append(item)
+            if rest and conn is None:
+                conn = self._open()
+            if rest and conn is None:
+                logger.error("%s: %d elementos perdidos al cerrar", self._thread.name, len(rest))
+            elif rest:
+                self._write(conn, rest)
+        finally:
+            if conn is not None:
+                conn.close()